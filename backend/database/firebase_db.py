@@ -8,6 +8,7 @@ from firebase_admin import credentials, firestore
 from google.cloud.firestore_v1 import FieldFilter
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
 from config import get_settings
@@ -66,6 +67,9 @@ class FirebaseDB:
     
     def __init__(self):
         self.db = get_firestore_client()
+        # Signalé à chaque écriture sur les places; la diffusion périodique
+        # du statut ne renvoie la liste que si cet événement est levé
+        self.places_changed = asyncio.Event()
     
     # ==================== PLACES DE PARKING ====================
     
@@ -85,6 +89,22 @@ class FirebaseDB:
             logger.error(f"Erreur lors de la récupération des places: {e}")
             raise
     
+    async def count_places_by_etat(self) -> Dict[str, int]:
+        """
+        Compte les places (total et par état) avec des requêtes
+        d'agrégation count(), sans transférer les documents.
+        """
+        try:
+            places_ref = self.db.collection(self.COLLECTION_PLACES)
+            counts = {"total": places_ref.count().get()[0][0].value}
+            for etat in ("free", "occupied", "reserved"):
+                query = places_ref.where(filter=FieldFilter("etat", "==", etat))
+                counts[etat] = query.count().get()[0][0].value
+            return counts
+        except Exception as e:
+            logger.error(f"Erreur lors du comptage des places: {e}")
+            raise
+    
     async def get_place_by_id(self, place_id: str) -> Optional[Dict[str, Any]]:
         """Récupère une place par son ID (ex: a1, a2)."""
         try:
@@ -124,6 +144,7 @@ class FirebaseDB:
                     "last_update": datetime.utcnow()
                 }
                 self.db.collection(self.COLLECTION_PLACES).document(place_id).set(place)
+                self.places_changed.set()
                 logger.info(f"Place {place_id} créée avec état {etat}")
                 return {"etat": etat, "transition": "created"}
             
@@ -163,6 +184,8 @@ class FirebaseDB:
             
             if updates:
                 self.db.collection(self.COLLECTION_PLACES).document(place_id).update(updates)
+                if transition:
+                    self.places_changed.set()
             
             new_etat = updates.get("etat", current_etat)
             logger.info(f"Place {place_id}: {current_etat} -> {new_etat}")
@@ -218,26 +241,33 @@ class FirebaseDB:
         
         try:
             result = reserve_in_transaction(transaction)
+            self.places_changed.set()
             logger.info(f"Place {place_id} réservée pour {user_id}")
             return result
         except Exception as e:
             logger.error(f"Échec de la réservation: {e}")
             raise
     
+    @staticmethod
+    def release_updates(now: datetime) -> Dict[str, Any]:
+        """Champs à écrire pour libérer une place (aussi utilisé en batch)."""
+        return {
+            "etat": "free",
+            "reserved_by": None,
+            "reserved_by_email": None,
+            "reservation_start_time": None,
+            "reservation_end_time": None,
+            "reservation_duration_minutes": None,
+            "last_update": now
+        }
+    
     async def release_place(self, place_id: str) -> bool:
         """Libère une place de parking."""
         try:
-            updates = {
-                "etat": "free",
-                "reserved_by": None,
-                "reserved_by_email": None,
-                "reservation_start_time": None,
-                "reservation_end_time": None,
-                "reservation_duration_minutes": None,
-                "last_update": datetime.utcnow()
-            }
+            updates = self.release_updates(datetime.utcnow())
             
             self.db.collection(self.COLLECTION_PLACES).document(place_id).update(updates)
+            self.places_changed.set()
             logger.info(f"Place {place_id} libérée")
             return True
         except Exception as e:
@@ -295,6 +325,7 @@ class FirebaseDB:
                 self.db.collection(self.COLLECTION_PLACES).document(place_id).set(place_data)
                 created_ids.append(place_id)
             
+            self.places_changed.set()
             logger.info(f"{count} places de parking initialisées")
             return created_ids
             
@@ -415,6 +446,7 @@ class FirebaseDB:
                 "reservation_status": status,
                 "status_updated_at": datetime.utcnow().isoformat()
             })
+            self.places_changed.set()
             logger.info(f"Statut de la réservation {reservation_id} mis à jour: {status}")
             return True
         except Exception as e:
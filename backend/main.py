@@ -80,7 +80,7 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Arrêt d'AeroPark Smart System...")
     
     try:
-        stop_scheduler()
+        await stop_scheduler()
         logger.info("✅ Scheduler arrêté")
     except Exception as e:
         logger.error(f"Erreur d'arrêt: {e}")
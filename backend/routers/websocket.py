@@ -107,6 +107,8 @@ async def handle_client_message(websocket: WebSocket, message: dict):
     Commandes supportées:
     - ping: Maintien de connexion
     - get_status: Récupérer l'état actuel du parking
+    - subscribe_places: Recevoir la liste complète des places dans les
+      diffusions périodiques status_update (sinon: compteurs seulement)
     
     Args:
         websocket: La connexion WebSocket du client
@@ -121,6 +123,14 @@ async def handle_client_message(websocket: WebSocket, message: dict):
             "timestamp": datetime.utcnow().isoformat()
         })
         
+    elif msg_type == "subscribe_places":
+        get_websocket_manager().subscribe_full_list(websocket)
+        await websocket.send_json({
+            "type": "subscribed",
+            "topic": "places",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
     elif msg_type == "get_status":
         # Envoyer l'état actuel du parking
         try:
@@ -20,6 +20,8 @@ class AccessCodeService:
     COLLECTION_CODES = "access_codes"
     CODE_LENGTH = 3
     CODE_CHARS = string.ascii_uppercase + string.digits  # A-Z, 0-9
+    # Durée de conservation après expiration (politique TTL Firestore sur purge_at)
+    PURGE_AFTER = timedelta(days=30)
     
     def __init__(self):
         self.db = get_db()
@@ -67,6 +69,8 @@ class AccessCodeService:
         # Créer le document du code
         code_data = {
             "code": code,
+            # Forme masquée pour les journaux, sans relire le code complet
+            "code_prefix": code[:2] + "***",
             "user_id": user_id,
             "user_email": user_email,
             "place_id": place_id,
@@ -74,6 +78,7 @@ class AccessCodeService:
             "status": "active",
             "created_at": datetime.utcnow(),
             "expires_at": expires_at,
+            "purge_at": expires_at + self.PURGE_AFTER,
             "used_at": None
         }
         
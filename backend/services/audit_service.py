@@ -82,6 +82,53 @@ class AuditService:
             return "*" * len(phone)
         return "*" * (len(phone) - 4) + phone[-4:]
     
+    def build_log_entry(
+        self,
+        event_type: AuditEventType,
+        decision: AuditDecision,
+        esp32_id: Optional[str] = None,
+        code: Optional[str] = None,
+        barrier_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        place_id: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Construit le document d'un événement d'audit (horodaté maintenant).
+        
+        Returns:
+            Dict prêt à être écrit dans la collection d'audit
+        """
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "event_type": event_type.value,
+            "decision": decision.value,
+            "esp32_id": esp32_id,
+            "code_masked": self._mask_code(code),
+            "barrier_id": barrier_id,
+            "user_id": user_id,
+            "place_id": place_id,
+            "ip_address": ip_address,
+            "details": details or {}
+        }
+    
+    def _log_to_file(self, log_entry: Dict[str, Any]):
+        """Écrit l'événement dans le log applicatif (backup)."""
+        decision = log_entry["decision"]
+        log_message = (
+            f"AUDIT | {log_entry['event_type']} | {decision} | "
+            f"ESP32: {log_entry['esp32_id'] or 'N/A'} | Code: {log_entry['code_masked']} | "
+            f"Barrier: {log_entry['barrier_id'] or 'N/A'}"
+        )
+        
+        if decision == AuditDecision.DENY:
+            logger.warning(log_message)
+        elif decision == AuditDecision.ERROR:
+            logger.error(log_message)
+        else:
+            logger.info(log_message)
+    
     async def log_event(
         self,
         event_type: AuditEventType,
@@ -103,36 +150,17 @@ class AuditService:
         try:
             db = self._get_db()
             
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "event_type": event_type.value,
-                "decision": decision.value,
-                "esp32_id": esp32_id,
-                "code_masked": self._mask_code(code),
-                "barrier_id": barrier_id,
-                "user_id": user_id,
-                "place_id": place_id,
-                "ip_address": ip_address,
-                "details": details or {}
-            }
+            log_entry = self.build_log_entry(
+                event_type, decision, esp32_id, code, barrier_id,
+                user_id, place_id, details, ip_address
+            )
             
             # Créer le document dans Firestore
             doc_ref = db.db.collection(self.COLLECTION_AUDIT_LOGS).document()
             doc_ref.set(log_entry)
             
             # Log aussi dans le fichier pour backup
-            log_message = (
-                f"AUDIT | {event_type.value} | {decision.value} | "
-                f"ESP32: {esp32_id or 'N/A'} | Code: {self._mask_code(code)} | "
-                f"Barrier: {barrier_id or 'N/A'}"
-            )
-            
-            if decision == AuditDecision.DENY:
-                logger.warning(log_message)
-            elif decision == AuditDecision.ERROR:
-                logger.error(log_message)
-            else:
-                logger.info(log_message)
+            self._log_to_file(log_entry)
             
             return doc_ref.id
             
@@ -141,6 +169,34 @@ class AuditService:
             # Ne pas lever d'exception pour ne pas bloquer le flux principal
             return ""
     
+    def log_batch(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Enregistre plusieurs événements déjà construits (build_log_entry)
+        avec un commit Firestore par tranche de 500 écritures.
+        Bloquant : l'appelant l'exécute hors de la boucle d'événements.
+        
+        Returns:
+            Nombre d'événements enregistrés
+        """
+        try:
+            db = self._get_db()
+            collection = db.db.collection(self.COLLECTION_AUDIT_LOGS)
+            
+            for start in range(0, len(entries), 500):
+                batch = db.db.batch()
+                for log_entry in entries[start:start + 500]:
+                    batch.set(collection.document(), log_entry)
+                batch.commit()
+            
+            for log_entry in entries:
+                self._log_to_file(log_entry)
+            
+            return len(entries)
+            
+        except Exception as e:
+            logger.error(f"Erreur d'enregistrement audit (lot de {len(entries)}): {e}")
+            return 0
+    
     async def log_barrier_attempt(
         self,
         barrier_id: str,
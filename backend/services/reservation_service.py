@@ -3,8 +3,8 @@ AeroPark Smart System - Reservation Service
 Handles all reservation operations and business logic.
 """
 
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, timezone
 import logging
 
 from database.firebase_db import get_db, FirebaseDB
@@ -195,45 +195,79 @@ class ReservationService:
             expires_at=new_end
         )
     
-    async def check_and_expire_reservations(self) -> int:
+    async def check_and_expire_reservations(
+        self,
+        places: Optional[List[Dict[str, Any]]] = None,
+        now: Optional[datetime] = None
+    ) -> int:
         """
         Check for expired reservations and release them.
         Called by the background scheduler.
         
+        Args:
+            places: Parking places already loaded by the caller; when given,
+                expired reservations are picked from them instead of queried
+            now: Current UTC time (defaults to now)
+        
         Returns:
             int: Number of expired reservations processed
+        
+        Raises:
+            Exception: Database errors propagate so the scheduler can
+                back off
         """
-        try:
+        if places is None:
             expired = await self.db.get_expired_reservations()
+        else:
+            expired = self._filter_expired(places, now or datetime.now(timezone.utc))
+        
+        if not expired:
+            return 0
+        
+        count = 0
+        for spot_data in expired:
+            spot_id = spot_data.get("id")
             
-            if not expired:
-                return 0
-            
-            count = 0
-            for spot_data in expired:
-                spot_id = spot_data.get("id")
+            # Only expire if still RESERVED (not OCCUPIED)
+            if spot_data.get("status") == "RESERVED":
+                await self.db.release_spot(
+                    spot_id,
+                    reason="Reservation expired without vehicle arrival"
+                )
                 
-                # Only expire if still RESERVED (not OCCUPIED)
-                if spot_data.get("status") == "RESERVED":
-                    await self.db.release_spot(
-                        spot_id,
-                        reason="Reservation expired without vehicle arrival"
-                    )
-                    
-                    # Broadcast expiry
-                    await self._broadcast_reservation_update(
-                        "reservation_expired",
-                        {"spot_id": spot_id}
-                    )
-                    
-                    count += 1
-                    logger.info(f"Expired reservation for spot {spot_id}")
-            
-            return count
-            
-        except Exception as e:
-            logger.error(f"Error checking expired reservations: {e}")
-            return 0
+                # Broadcast expiry
+                await self._broadcast_reservation_update(
+                    "reservation_expired",
+                    {"spot_id": spot_id}
+                )
+                
+                count += 1
+                logger.info(f"Expired reservation for spot {spot_id}")
+        
+        return count
+    
+    def _filter_expired(
+        self,
+        places: List[Dict[str, Any]],
+        now: datetime
+    ) -> List[Dict[str, Any]]:
+        """Select reserved places whose reservation_end_time has passed."""
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        
+        expired = []
+        for place in places:
+            if place.get("etat") != "reserved":
+                continue
+            end_time = place.get("reservation_end_time")
+            if not isinstance(end_time, datetime):
+                continue
+            # Firestore returns aware datetimes; naive values are UTC
+            if end_time.tzinfo is None:
+                end_time = end_time.replace(tzinfo=timezone.utc)
+            if end_time < now:
+                expired.append(place)
+        return expired
     
     async def _broadcast_reservation_update(self, event_type: str, data: Any):
         """Broadcast reservation update to all WebSocket clients."""
@@ -5,15 +5,24 @@ Notifie l'ESP32 des nouvelles réservations.
 """
 
 from fastapi import WebSocket
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import asyncio
 import logging
 from datetime import datetime
 
+import orjson
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _json_default(value: Any) -> str:
+    """Sérialise les timestamps que orjson ne gère pas (ex: Firestore)."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError
+
+
 class WebSocketManager:
     """
     Gestionnaire de connexions WebSocket.
@@ -24,6 +33,8 @@ class WebSocketManager:
     def __init__(self):
         # Connexions WebSocket actives
         self.active_connections: List[WebSocket] = []
+        # Clients abonnés à la liste complète des places dans status_update
+        self.full_list_subscribers: Set[WebSocket] = set()
         # Lock pour les opérations thread-safe
         self._lock = asyncio.Lock()
     
@@ -50,6 +61,7 @@ class WebSocketManager:
         async with self._lock:
             if websocket in self.active_connections:
                 self.active_connections.remove(websocket)
+            self.full_list_subscribers.discard(websocket)
         
         logger.info(f"WebSocket déconnecté. Total: {len(self.active_connections)}")
     
@@ -143,28 +155,57 @@ class WebSocketManager:
         """Retourne le nombre de connexions actives."""
         return len(self.active_connections)
     
+    def subscribe_full_list(self, websocket: WebSocket):
+        """
+        Abonne un client à la liste complète des places dans les
+        diffusions périodiques status_update.
+        
+        Args:
+            websocket: La connexion WebSocket du client
+        """
+        self.full_list_subscribers.add(websocket)
+    
+    def clients_want_full_list(self) -> bool:
+        """Indique si au moins un client attend la liste complète des places."""
+        return bool(self.full_list_subscribers)
+    
+    async def broadcast_prepared(self, payload: str):
+        """
+        Diffuse un message JSON déjà sérialisé à tous les clients,
+        en parallèle.
+        
+        Args:
+            payload: Message JSON encodé une seule fois pour tous les clients
+        """
+        if not self.active_connections:
+            return
+        
+        async with self._lock:
+            connections = list(self.active_connections)
+        
+        results = await asyncio.gather(
+            *(ws.send_text(payload) for ws in connections),
+            return_exceptions=True
+        )
+        
+        # Nettoyer les clients déconnectés
+        for ws, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Erreur d'envoi websocket: {result}")
+                await self.disconnect(ws)
+    
     async def broadcast_parking_status(self, status: Dict[str, Any]):
         """
         Diffuse le statut complet du parking à tous les clients.
+        Le JSON est encodé une seule fois (orjson), pas une fois par client.
         
         Args:
             status: Dictionnaire avec le statut du parking
         """
-        # Convertir les timestamps Firebase en strings
-        if "places" in status:
-            safe_places = []
-            for p in status["places"]:
-                safe_place = {}
-                for k, v in p.items():
-                    if hasattr(v, 'isoformat'):
-                        safe_place[k] = v.isoformat()
-                    else:
-                        safe_place[k] = v
-                safe_places.append(safe_place)
-            status["places"] = safe_places
-        
         status["timestamp"] = datetime.utcnow().isoformat()
-        await self.broadcast(status)
+        # Les timestamps Firebase passent par _json_default
+        payload = orjson.dumps(status, default=_json_default).decode()
+        await self.broadcast_prepared(payload)
 
 
 # Instance singleton
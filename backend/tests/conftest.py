@@ -6,18 +6,34 @@ Usage:
     pytest tests/ -v
     pytest tests/test_sensor.py -v
     pytest tests/ -v --tb=short
+    pytest tests/ --lf               # only the last failures
+    pytest tests/ --ff               # last failures first, then the rest
+    pytest tests/ -n auto --dist loadgroup   # parallel (pytest-xdist)
 """
 
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
 import os
 import sys
+from types import MappingProxyType
+from typing import Mapping
+
+import httpx
+import orjson
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers", "authed: authenticate requests as the mock_user fixture"
+    )
+
+
 # ============================================================
 # MOCK FIREBASE BEFORE IMPORTING APP
 # ============================================================
@@ -32,53 +48,79 @@ def mock_firebase():
             yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def reject_firebase_tokens(mock_firebase):
+    """
+    Reject every bearer token without touching the Firebase SDK.
+    Unauthenticated tests get a fast 401 (InvalidIdTokenError); tests that
+    need a user override get_current_user instead.
+    """
+    from firebase_admin import auth
+
+    def _reject(token, *args, **kwargs):
+        raise auth.InvalidIdTokenError("Token rejected in tests")
+
+    with patch("security.firebase_auth.auth.verify_id_token", side_effect=_reject):
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def orjson_responses():
+    """Decode TestClient response bodies with orjson instead of stdlib json."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", lambda self, **kwargs: orjson.loads(self.content))
+        yield
+
+
 # ============================================================
 # API KEY FIXTURES
 # ============================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> str:
     """Valid API key for sensor/barrier endpoints."""
     return "aeropark-sensor-key-2024"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_api_key() -> str:
     """Invalid API key for testing rejection."""
     return "invalid-key-12345"
 
 
-@pytest.fixture
-def api_key_header(api_key: str) -> dict:
+# Header fixtures are shared by the whole session, so they are read-only
+# mappings; merge into a new dict ({**JSON_HEADERS, **api_key_header}) to extend.
+
+@pytest.fixture(scope="session")
+def api_key_header(api_key: str) -> Mapping[str, str]:
     """Headers with valid API key (singular naming for convenience)."""
-    return {"X-API-Key": api_key}
+    return MappingProxyType({"X-API-Key": api_key})
 
 
-@pytest.fixture
-def api_key_headers(api_key: str) -> dict:
+@pytest.fixture(scope="session")
+def api_key_headers(api_key_header: Mapping[str, str]) -> Mapping[str, str]:
     """Headers with valid API key."""
-    return {"X-API-Key": api_key}
+    return api_key_header
 
 
-@pytest.fixture
-def invalid_api_key_header(invalid_api_key: str) -> dict:
+@pytest.fixture(scope="session")
+def invalid_api_key_header(invalid_api_key: str) -> Mapping[str, str]:
     """Headers with invalid API key."""
-    return {"X-API-Key": invalid_api_key}
+    return MappingProxyType({"X-API-Key": invalid_api_key})
 
 
-@pytest.fixture
-def invalid_api_key_headers(invalid_api_key: str) -> dict:
+@pytest.fixture(scope="session")
+def invalid_api_key_headers(invalid_api_key_header: Mapping[str, str]) -> Mapping[str, str]:
     """Headers with invalid API key."""
-    return {"X-API-Key": invalid_api_key}
+    return invalid_api_key_header
 
 
 # ============================================================
 # MOCK DATABASE FIXTURES
 # ============================================================
 
-@pytest.fixture
-def mock_db():
-    """Mock database with common methods."""
+def _build_mock_db() -> MagicMock:
+    """Build a mock database with common methods."""
     mock = MagicMock()
     
     # Default parking places
@@ -113,24 +155,18 @@ def mock_db():
 
 
 @pytest.fixture
-def mock_full_parking_db():
-    """Mock database with all places occupied (full parking)."""
-    mock = MagicMock()
-    
-    mock.get_all_places = AsyncMock(return_value=[
-        {"place_id": "a1", "etat": "occupied", "reserved_by": None},
-        {"place_id": "a2", "etat": "occupied", "reserved_by": None},
-        {"place_id": "a3", "etat": "occupied", "reserved_by": None},
-        {"place_id": "a4", "etat": "reserved", "reserved_by": "user123"},
-        {"place_id": "a5", "etat": "occupied", "reserved_by": None},
-        {"place_id": "a6", "etat": "occupied", "reserved_by": None},
-    ])
-    
-    mock.get_place_by_id = AsyncMock(return_value={
-        "place_id": "a1", "etat": "occupied", "reserved_by": None
-    })
-    
-    return mock
+def mock_db():
+    """Mock database with common methods."""
+    return _build_mock_db()
+
+
+@pytest.fixture(scope="module")
+def module_mock_db():
+    """
+    Same mock database, built once per module.
+    For read-only responses shared by several tests.
+    """
+    return _build_mock_db()
 
 
 # ============================================================
@@ -163,29 +199,153 @@ def mock_admin():
 # TEST CLIENT FIXTURE
 # ============================================================
 
-@pytest.fixture
-def client(mock_db):
-    """FastAPI TestClient with mocked dependencies."""
-    # Patch Firebase and DB before importing app
-    with patch("database.firebase_db.init_firebase"):
-        with patch("database.firebase_db.get_db", return_value=mock_db):
-            with patch("utils.scheduler.start_scheduler"):
-                with patch("utils.scheduler.stop_scheduler"):
-                    from main import app
-                    with TestClient(app) as test_client:
-                        yield test_client
+WARMUP_PATHS = (
+    "/parking/status",
+    "/parking/available",
+    "/api/v1/payment/pricing",
+)
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    FastAPI TestClient shared by the whole session.
+    The app lifespan runs once; tests isolate DB state by patching the
+    router-level get_db with the function-scoped mock_db.
+    A few GETs are sent up front to warm routing and dependency
+    resolution; their responses are ignored.
+    """
+    with TestClient(app) as test_client:
+        for path in WARMUP_PATHS:
+            test_client.get(path)
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def bare_client(app):
+    """
+    TestClient that is never entered as a context manager, so the app
+    lifespan (Firebase init, default places, scheduler) never runs.
+    For routers that need no startup state and get a patched get_db.
+    """
+    return TestClient(app)
 
 
-@pytest.fixture
-def client_full_parking(mock_full_parking_db):
-    """TestClient with full parking simulation."""
+# ============================================================
+# RAW ASGI PROBE FIXTURES
+# ============================================================
+
+@pytest.fixture(scope="session")
+def app(mock_firebase):
+    """FastAPI application imported once with Firebase and scheduler patched."""
     with patch("database.firebase_db.init_firebase"):
-        with patch("database.firebase_db.get_db", return_value=mock_full_parking_db):
-            with patch("utils.scheduler.start_scheduler"):
-                with patch("utils.scheduler.stop_scheduler"):
-                    from main import app
-                    with TestClient(app) as test_client:
-                        yield test_client
+        with patch("utils.scheduler.start_scheduler"):
+            with patch("utils.scheduler.stop_scheduler"):
+                from main import app as fastapi_app
+    return fastapi_app
+
+
+async def _probe(app, method: str, path: str, headers: dict = None, body=None) -> int:
+    """
+    Drive the ASGI app with a pre-built scope and return the response status.
+    Skips the httpx Request/Response machinery used by TestClient.
+    body may be a dict (serialized with orjson) or pre-serialized JSON bytes.
+    """
+    raw_headers = [
+        (key.lower().encode("latin-1"), value.encode("latin-1"))
+        for key, value in (headers or {}).items()
+    ]
+    payload = b""
+    if body is not None:
+        payload = body if isinstance(body, bytes) else orjson.dumps(body)
+        raw_headers.append((b"content-type", b"application/json"))
+        raw_headers.append((b"content-length", str(len(payload)).encode()))
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": raw_headers,
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    response_status = None
+    
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+    
+    async def send(message):
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+    
+    await app(scope, receive, send)
+    return response_status
+
+
+@pytest.fixture(scope="session")
+def probe(app):
+    """Callable returning the status code of a single raw ASGI request."""
+    def _run(method: str, path: str, headers: dict = None, body=None) -> int:
+        return asyncio.run(_probe(app, method, path, headers, body))
+    return _run
+
+
+# ============================================================
+# OPENAPI SCHEMA FIXTURES
+# ============================================================
+
+@pytest.fixture(scope="session")
+def registered_paths(app) -> frozenset:
+    """Path templates of every route registered on the app."""
+    return frozenset(route.path for route in app.routes)
+
+
+@pytest.fixture(scope="session")
+def route_match(app):
+    """
+    Resolve (method, path) against the app's routes in-process, the way
+    Starlette's router does, without building or serializing a response.
+    Returns Match.FULL (route + method), Match.PARTIAL (path only, i.e. 405)
+    or Match.NONE (404).
+    """
+    from starlette.routing import Match
+
+    def _match(method: str, path: str) -> Match:
+        scope = {"type": "http", "method": method.upper(), "path": path, "root_path": ""}
+        best = Match.NONE
+        for route in app.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return match
+            if match is Match.PARTIAL:
+                best = match
+        return best
+
+    return _match
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(app) -> dict:
+    """OpenAPI schema built once per session (FastAPI caches it on the app)."""
+    return app.openapi()
+
+
+@pytest.fixture(scope="session")
+def openapi_paths(openapi_schema: dict) -> frozenset:
+    """Set of documented API paths."""
+    return frozenset(openapi_schema["paths"].keys())
 
 
 # ============================================================
@@ -226,42 +386,6 @@ def mock_access_code_service():
     return mock
 
 
-# ============================================================
-# PAYMENT FIXTURES
-# ============================================================
-
-@pytest.fixture
-def mock_payment_service():
-    """Mock payment service."""
-    mock = MagicMock()
-    
-    mock.simulate_payment = AsyncMock(return_value={
-        "success": True,
-        "payment_id": "PAY-123456",
-        "status": "success",
-        "message": "Paiement simulé avec succès",
-        "access_code": "A7F",
-        "amount": 500,
-        "currency": "XAF"
-    })
-    
-    mock.get_pricing_info = AsyncMock(return_value={
-        "hourly_rate": 100,
-        "daily_max": 1000,
-        "first_minutes_free": 15,
-        "currency": "XAF",
-        "currency_symbol": "FCFA"
-    })
-    
-    mock.get_payment = AsyncMock(return_value={
-        "payment_id": "PAY-123456",
-        "status": "success",
-        "amount": 500
-    })
-    
-    return mock
-
-
 # ============================================================
 # BARRIER SERVICE FIXTURES
 # ============================================================
@@ -280,10 +404,44 @@ def mock_barrier_service():
         "open_barrier": True,
         "free_spots": 4
     })
+    mock.process_exit = AsyncMock(return_value={
+        "access_granted": True,
+        "message": "Bonne route!",
+        "open_barrier": True
+    })
+    mock.get_parking_status = AsyncMock(return_value={
+        "total": 6,
+        "free": 4,
+        "reserved": 1,
+        "occupied": 1
+    })
+    mock.get_barrier_status = AsyncMock(return_value={
+        "barrier_id": "entry",
+        "status": "closed",
+        "last_action": None,
+        "last_action_time": None,
+        "parking_available_spots": 4,
+        "parking_total_spots": 6,
+        "auto_open_allowed": True
+    })
     
     return mock
 
 
+@pytest.fixture
+def mock_access_services(monkeypatch, app, mock_access_code_service, mock_barrier_service):
+    """
+    Route access/barrier endpoints to in-memory service mocks.
+    Requests that pass API key auth return at the router layer without DB work.
+    """
+    import routers.access as access_mod
+    import routers.barrier as barrier_mod
+    monkeypatch.setattr(access_mod, "get_access_code_service", lambda: mock_access_code_service)
+    monkeypatch.setattr(access_mod, "get_barrier_service", lambda: mock_barrier_service)
+    monkeypatch.setattr(barrier_mod, "get_barrier_service", lambda: mock_barrier_service)
+    return mock_barrier_service
+
+
 # ============================================================
 # SAMPLE TEST DATA
 # ============================================================
@@ -298,17 +456,6 @@ def sensor_update_payload() -> dict:
     }
 
 
-@pytest.fixture
-def mobile_money_payload() -> dict:
-    """Valid mobile money simulation payload."""
-    return {
-        "provider": "ORANGE_MONEY",
-        "phone_number": "0612345678",
-        "amount": 500,
-        "reservation_id": "a1"
-    }
-
-
 @pytest.fixture
 def validate_code_payload(valid_access_code: str) -> dict:
     """Valid code validation payload."""
@@ -0,0 +1,3 @@
+"""
+AeroPark Smart System - Parking Endpoint Tests
+"""
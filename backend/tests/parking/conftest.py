@@ -0,0 +1,138 @@
+"""
+AeroPark Smart System - Parking Test Fixtures
+Fixtures shared by the parking endpoint tests: router get_db patching,
+mock_user authentication, DB method mocks and the async client.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+# ============================================================
+# MOCK DATABASE FIXTURES
+# ============================================================
+
+@pytest.fixture
+def mock_full_parking_db():
+    """Mock database with all places occupied (full parking)."""
+    mock = MagicMock()
+    
+    mock.get_all_places = AsyncMock(return_value=[
+        {"place_id": "a1", "etat": "occupied", "reserved_by": None},
+        {"place_id": "a2", "etat": "occupied", "reserved_by": None},
+        {"place_id": "a3", "etat": "occupied", "reserved_by": None},
+        {"place_id": "a4", "etat": "reserved", "reserved_by": "user123"},
+        {"place_id": "a5", "etat": "occupied", "reserved_by": None},
+        {"place_id": "a6", "etat": "occupied", "reserved_by": None},
+    ])
+    
+    mock.get_place_by_id = AsyncMock(return_value={
+        "place_id": "a1", "etat": "occupied", "reserved_by": None
+    })
+    
+    return mock
+
+
+# ============================================================
+# DB METHOD MOCKS
+# ============================================================
+
+_RESERVE_OK = {
+    "success": True,
+    "place_id": "a1",
+    "reservation_id": "res-123",
+    "expires_at": "2026-01-20T13:00:00Z"
+}
+
+
+@pytest.fixture
+def reserve_ok_mock() -> AsyncMock:
+    """reserve_place mock returning a successful reservation."""
+    return AsyncMock(return_value=_RESERVE_OK)
+
+
+@pytest.fixture
+def reserve_full_mock() -> AsyncMock:
+    """reserve_place mock failing because the parking is full."""
+    return AsyncMock(side_effect=ValueError("No free places available"))
+
+
+@pytest.fixture
+def reserve_taken_mock() -> AsyncMock:
+    """reserve_place mock failing because the place is already reserved."""
+    return AsyncMock(side_effect=ValueError("Place already reserved"))
+
+
+@pytest.fixture
+def place_missing_mock() -> AsyncMock:
+    """get_place_by_id mock for an unknown place."""
+    return AsyncMock(return_value=None)
+
+
+# ============================================================
+# ROUTER PATCHING FIXTURES
+# ============================================================
+
+@pytest.fixture(scope="session")
+def parking_module(app):
+    """routers.parking, imported once the app (and its Firebase patches) is up."""
+    import routers.parking as parking_mod
+    return parking_mod
+
+
+@pytest.fixture(autouse=True)
+def _patch_parking_db(request, monkeypatch, parking_module):
+    """
+    Route routers.parking.get_db to the mock DB the test asked for
+    (mock_full_parking_db over mock_db). Tests requesting neither build no
+    DB mock and leave get_db untouched.
+    """
+    for name in ("mock_full_parking_db", "mock_db"):
+        if name in request.fixturenames:
+            db = request.getfixturevalue(name)
+            monkeypatch.setattr(parking_module, "get_db", lambda: db)
+            return
+
+
+@pytest.fixture(autouse=True)
+def _authenticate_mock_user(request, monkeypatch, app):
+    """Authenticate requests as mock_user for tests marked @pytest.mark.authed."""
+    if request.node.get_closest_marker("authed") is None:
+        return
+    from security.firebase_auth import get_current_user
+    mock_user = request.getfixturevalue("mock_user")
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: mock_user)
+
+
+# ============================================================
+# CLIENT FIXTURES
+# ============================================================
+
+@pytest.fixture(scope="session")
+def client_full_parking(client):
+    """TestClient for full parking tests (paired with mock_full_parking_db)."""
+    return client
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole session, shared by async tests and fixtures."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(app):
+    """
+    httpx AsyncClient driving the app in-process on the session event loop.
+    Used by tests with AsyncMock-backed DB calls, avoiding TestClient's
+    per-request portal thread.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
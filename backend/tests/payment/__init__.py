@@ -0,0 +1,3 @@
+"""
+AeroPark Smart System - Payment Endpoint Tests
+"""
@@ -0,0 +1,59 @@
+"""
+AeroPark Smart System - Payment Test Fixtures
+Fixtures shared by the payment endpoint tests.
+"""
+
+from unittest.mock import MagicMock, AsyncMock
+
+import pytest
+
+
+# ============================================================
+# PAYMENT FIXTURES
+# ============================================================
+
+@pytest.fixture
+def mock_payment_service():
+    """Mock payment service."""
+    mock = MagicMock()
+    
+    mock.simulate_payment = AsyncMock(return_value={
+        "success": True,
+        "payment_id": "PAY-123456",
+        "status": "success",
+        "message": "Paiement simulé avec succès",
+        "access_code": "A7F",
+        "amount": 500,
+        "currency": "XAF"
+    })
+    
+    mock.get_pricing_info = AsyncMock(return_value={
+        "hourly_rate": 100,
+        "daily_max": 1000,
+        "first_minutes_free": 15,
+        "currency": "XAF",
+        "currency_symbol": "FCFA"
+    })
+    
+    mock.get_payment = AsyncMock(return_value={
+        "payment_id": "PAY-123456",
+        "status": "success",
+        "amount": 500
+    })
+    
+    return mock
+
+
+# ============================================================
+# SAMPLE TEST DATA
+# ============================================================
+
+@pytest.fixture
+def mobile_money_payload() -> dict:
+    """Valid mobile money simulation payload."""
+    return {
+        "provider": "ORANGE_MONEY",
+        "phone_number": "0612345678",
+        "amount": 500,
+        "reservation_id": "a1"
+    }
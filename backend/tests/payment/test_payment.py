@@ -0,0 +1,123 @@
+"""
+AeroPark Smart System - Payment Endpoint Tests
+Tests for mobile money simulation and payment status endpoints.
+
+Run: pytest tests/payment/test_payment.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.routing import Match
+
+
+class TestPaymentStatus:
+    """Tests for GET /api/v1/payment/status/{payment_id} endpoint."""
+    
+    def test_payment_status_with_valid_api_key(
+        self, 
+        client: TestClient, 
+        api_key_header
+    ):
+        """
+        Test: Valid API key allows payment status check
+        Expected: Not 401/403
+        """
+        response = client.get(
+            "/api/v1/payment/status/pay-123",
+            headers=api_key_header
+        )
+        
+        # Should pass auth
+        assert response.status_code not in [401, 403]
+
+
+class TestPaymentEndpointsExist:
+    """Tests that payment endpoints are properly registered."""
+    
+    @pytest.mark.parametrize("method,path", [
+        ("POST", "/api/v1/payment/mobile-money/simulate"),
+        ("GET", "/api/v1/payment/status/test-id"),
+        ("POST", "/api/v1/payment/simulate"),
+        ("GET", "/api/v1/payment/pricing"),
+        ("POST", "/api/v1/payment/calculate"),
+        ("GET", "/api/v1/payment/mobile-money/providers"),
+    ])
+    def test_payment_endpoint_registered(self, route_match, method: str, path: str):
+        """
+        Test: Payment endpoint is registered for its method
+        Expected: Full route match (no 404, no 405)
+        """
+        assert route_match(method, path) is Match.FULL
+
+
+class TestPaymentMethodValidation:
+    """Tests for correct HTTP methods on payment endpoints."""
+    
+    @pytest.mark.parametrize("method,path", [
+        ("GET", "/api/v1/payment/mobile-money/simulate"),
+        ("POST", "/api/v1/payment/status/test-id"),
+        ("GET", "/api/v1/payment/simulate"),
+    ])
+    def test_wrong_method_returns_405(self, route_match, method: str, path: str):
+        """
+        Test: Payment endpoints reject the wrong HTTP method
+        Expected: Path matches but method does not (router answers 405)
+        """
+        assert route_match(method, path) is Match.PARTIAL
+
+
+class TestMobileMoneyProviders:
+    """Tests for mobile money providers endpoint."""
+    
+    def test_providers_returns_list(self, client: TestClient, api_key_header):
+        """
+        Test: Providers endpoint returns list of providers
+        Expected: List containing ORANGE_MONEY, AIRTEL_MONEY, MPESA
+        """
+        response = client.get(
+            "/api/v1/payment/mobile-money/providers",
+            headers=api_key_header
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            # Should have providers
+            assert "providers" in data or isinstance(data, list)
+
+
+class TestPaymentPricing:
+    """Tests for payment pricing endpoint."""
+    
+    def test_pricing_requires_api_key(self, client: TestClient):
+        """
+        Test: Pricing endpoint may require API key
+        Expected: Returns pricing info or auth error
+        """
+        response = client.get("/api/v1/payment/pricing")
+        
+        # Check if it requires auth or returns pricing
+        if response.status_code == 200:
+            data = response.json()
+            # Should have pricing info
+            assert data is not None
+    
+    def test_pricing_returns_rate_info(self, client: TestClient, api_key_header):
+        """
+        Test: Pricing returns rate information
+        Expected: hourly_rate or similar fields
+        """
+        response = client.get(
+            "/api/v1/payment/pricing",
+            headers=api_key_header
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            # Should have pricing fields
+            has_pricing = (
+                "hourly_rate" in data or
+                "rate" in data or
+                "price" in data or
+                "currency" in data
+            )
+            assert has_pricing or data
@@ -5,39 +5,74 @@ Tests for access validation, entry, and exit endpoints.
 Run: pytest tests/test_access.py -v
 """
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
 
-class TestAccessValidateCode:
-    """Tests for POST /api/v1/access/validate-code endpoint."""
-    
-    def test_validate_code_requires_api_key(self, client: TestClient):
+# Request bodies shared across tests, serialized once at import time
+VALID_PAYLOAD = {"code": "A7F", "sensor_presence": True, "barrier_id": "entry"}
+NOBARRIER_PAYLOAD = {"code": "A7F", "sensor_presence": True}
+EXIT_PAYLOAD = {"place_id": "a1"}
+VALID_PAYLOAD_BYTES = orjson.dumps(VALID_PAYLOAD)
+NOBARRIER_PAYLOAD_BYTES = orjson.dumps(NOBARRIER_PAYLOAD)
+EXIT_PAYLOAD_BYTES = orjson.dumps(EXIT_PAYLOAD)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+INVALID_KEY = {"X-API-Key": "invalid-key-123"}
+EMPTY_KEY = {"X-API-Key": ""}
+
+ACCESS_PROTECTED_ROUTES = [
+    ("POST", "/api/v1/access/validate-code", NOBARRIER_PAYLOAD, [401, 403]),
+    ("POST", "/api/v1/access/check-entry", {}, [401, 403, 422]),
+    ("POST", "/api/v1/access/exit", EXIT_PAYLOAD, [401, 403, 422]),
+    ("GET", "/api/v1/barrier/status", None, [401, 403]),
+    ("GET", "/api/v1/barrier/parking-info", None, [401, 403]),
+]
+
+# (path, response keys of which at least one must be present on 200)
+BARRIER_ROUTES = [
+    ("/api/v1/barrier/status", None),
+    ("/api/v1/barrier/parking-info", {"total_spots", "free_spots"}),
+]
+
+
+class TestAccessAuthentication:
+    """Tests for API key requirements on access control and barrier endpoints."""
+    
+    @pytest.mark.parametrize("method,path,payload,expected", ACCESS_PROTECTED_ROUTES)
+    def test_access_route_requires_api_key(
+        self,
+        probe,
+        method: str,
+        path: str,
+        payload: dict,
+        expected: list
+    ):
         """
-        Test: Validate code requires X-API-Key header
+        Test: Access control and barrier endpoints require X-API-Key header
         Expected: Status 401/403 without API key
         """
-        payload = {"code": "A7F", "sensor_presence": True}
-        
-        response = client.post("/api/v1/access/validate-code", json=payload)
-        
-        assert response.status_code in [401, 403]
+        assert probe(method, path, body=payload) in expected
+
+
+class TestAccessValidateCode:
+    """Tests for POST /api/v1/access/validate-code endpoint."""
     
     def test_validate_code_with_valid_api_key_accepts_request(
         self, 
         client: TestClient, 
-        api_key_header
+        api_key_header,
+        mock_access_services
     ):
         """
         Test: Valid API key allows request processing
         Expected: Not 401/403
         """
-        payload = {"code": "A7F", "sensor_presence": True, "barrier_id": "entry"}
-        
         response = client.post(
             "/api/v1/access/validate-code",
-            json=payload,
-            headers=api_key_header
+            content=VALID_PAYLOAD_BYTES,
+            headers={**JSON_HEADERS, **api_key_header}
         )
         
         # Should pass auth (not 401/403), may fail for other reasons
@@ -92,12 +127,10 @@ class TestAccessValidateCode:
         Test: Response includes access_granted field
         Expected: access_granted in response body
         """
-        payload = {"code": "A7F", "sensor_presence": True, "barrier_id": "entry"}
-        
         response = client.post(
             "/api/v1/access/validate-code",
-            json=payload,
-            headers=api_key_header
+            content=VALID_PAYLOAD_BYTES,
+            headers={**JSON_HEADERS, **api_key_header}
         )
         
         # If successful, should have access_granted field
@@ -109,20 +142,11 @@ class TestAccessValidateCode:
 class TestAccessCheckEntry:
     """Tests for POST /api/v1/access/check-entry endpoint."""
     
-    def test_check_entry_requires_api_key(self, client: TestClient):
-        """
-        Test: Check entry requires API key
-        Expected: Status 401/403 without key
-        """
-        # Empty payload or minimal - check what endpoint expects
-        response = client.post("/api/v1/access/check-entry", json={})
-        
-        assert response.status_code in [401, 403, 422]
-    
     def test_check_entry_with_valid_api_key(
         self, 
         client: TestClient, 
-        api_key_header
+        api_key_header,
+        mock_access_services
     ):
         """
         Test: Valid API key allows check entry
@@ -141,32 +165,20 @@ class TestAccessCheckEntry:
 class TestAccessExit:
     """Tests for POST /api/v1/access/exit endpoint."""
     
-    def test_exit_requires_api_key(self, client: TestClient):
-        """
-        Test: Exit endpoint requires API key
-        Expected: Status 401/403 without key
-        """
-        payload = {"place_id": "a1"}
-        
-        response = client.post("/api/v1/access/exit", json=payload)
-        
-        assert response.status_code in [401, 403, 422]
-    
     def test_exit_with_valid_api_key(
         self, 
         client: TestClient, 
-        api_key_header
+        api_key_header,
+        mock_access_services
     ):
         """
         Test: Exit with valid API key accepted
         Expected: Not 401/403
         """
-        payload = {"place_id": "a1"}
-        
         response = client.post(
             "/api/v1/access/exit",
-            json=payload,
-            headers=api_key_header
+            content=EXIT_PAYLOAD_BYTES,
+            headers={**JSON_HEADERS, **api_key_header}
         )
         
         # Should pass auth
@@ -176,48 +188,20 @@ class TestAccessExit:
 class TestAccessAPIKeyVariations:
     """Tests for API key authentication variations."""
     
-    def test_invalid_api_key_rejected(self, client: TestClient):
+    @pytest.mark.parametrize("headers", [
+        {},
+        EMPTY_KEY,
+        INVALID_KEY,
+    ], ids=["missing", "empty", "invalid"])
+    def test_api_key_rejected(self, client: TestClient, headers: dict):
         """
-        Test: Invalid API key is rejected
+        Test: Missing, empty or invalid API key is rejected
         Expected: Status 401/403
         """
-        invalid_header = {"X-API-Key": "invalid-key-123"}
-        payload = {"code": "A7F", "sensor_presence": True}
-        
         response = client.post(
             "/api/v1/access/validate-code",
-            json=payload,
-            headers=invalid_header
-        )
-        
-        assert response.status_code in [401, 403]
-    
-    def test_missing_api_key_rejected(self, client: TestClient):
-        """
-        Test: Missing API key is rejected
-        Expected: Status 401/403
-        """
-        payload = {"code": "A7F", "sensor_presence": True}
-        
-        response = client.post(
-            "/api/v1/access/validate-code",
-            json=payload
-        )
-        
-        assert response.status_code in [401, 403]
-    
-    def test_empty_api_key_rejected(self, client: TestClient):
-        """
-        Test: Empty API key is rejected
-        Expected: Status 401/403
-        """
-        empty_header = {"X-API-Key": ""}
-        payload = {"code": "A7F", "sensor_presence": True}
-        
-        response = client.post(
-            "/api/v1/access/validate-code",
-            json=payload,
-            headers=empty_header
+            content=NOBARRIER_PAYLOAD_BYTES,
+            headers={**JSON_HEADERS, **headers}
         )
         
         assert response.status_code in [401, 403]
@@ -226,57 +210,23 @@ class TestAccessAPIKeyVariations:
 class TestBarrierEndpoints:
     """Tests for barrier control endpoints."""
     
-    def test_barrier_status_requires_api_key(self, client: TestClient):
-        """
-        Test: Barrier status requires API key
-        Expected: Status 401/403 without key
-        """
-        response = client.get("/api/v1/barrier/status")
-        
-        assert response.status_code in [401, 403]
-    
-    def test_barrier_status_with_api_key(
+    @pytest.mark.parametrize("path,shape", BARRIER_ROUTES)
+    def test_barrier_with_api_key(
         self, 
         client: TestClient, 
-        api_key_header
+        api_key_header,
+        mock_access_services,
+        path: str,
+        shape: set
     ):
         """
-        Test: Barrier status with valid API key
-        Expected: Status 200 or appropriate response
+        Test: Barrier endpoints accept a valid API key
+        Expected: Not 401/403; parking info exposes spot counts
         """
-        response = client.get(
-            "/api/v1/barrier/status",
-            headers=api_key_header
-        )
+        response = client.get(path, headers=api_key_header)
         
         # Should pass auth
         assert response.status_code not in [401, 403]
-    
-    def test_barrier_parking_info_requires_api_key(self, client: TestClient):
-        """
-        Test: Barrier parking info requires API key
-        Expected: Status 401/403 without key
-        """
-        response = client.get("/api/v1/barrier/parking-info")
         
-        assert response.status_code in [401, 403]
-    
-    def test_barrier_parking_info_with_api_key(
-        self, 
-        client: TestClient, 
-        api_key_header
-    ):
-        """
-        Test: Barrier parking info with API key
-        Expected: Returns parking availability info
-        """
-        response = client.get(
-            "/api/v1/barrier/parking-info",
-            headers=api_key_header
-        )
-        
-        # Should pass auth
-        if response.status_code == 200:
-            data = response.json()
-            # Should have parking info fields
-            assert "total_spots" in data or "free_spots" in data or data
+        if shape and response.status_code == 200:
+            assert shape & response.json().keys()
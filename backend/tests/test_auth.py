@@ -0,0 +1,63 @@
+"""
+AeroPark Smart System - Authentication Requirement Tests
+Tests that user-facing endpoints reject requests without valid credentials.
+
+Run: pytest tests/test_auth.py -v
+"""
+
+import orjson
+import pytest
+
+
+# Request bodies serialized once at import
+MOBILE_MONEY_PAYLOAD = orjson.dumps({
+    "phone_number": "+243900000001",
+    "amount": 5000,
+    "provider": "ORANGE_MONEY",
+    "reservation_id": "res-123"
+})
+RESERVE_PAYLOAD = orjson.dumps({"place_id": "a1"})
+
+# (method, path, credentials, payload, accepted status codes)
+# credentials: None for no header, "api_key" for a valid sensor API key only
+AUTH_REQUIRED_ROUTES = [
+    ("POST", "/parking/reserve", None, RESERVE_PAYLOAD, [401, 403, 422]),
+    ("POST", "/parking/release/a1", None, None, [401, 403, 422]),
+    ("POST", "/api/v1/payment/mobile-money/simulate", None, MOBILE_MONEY_PAYLOAD, [401, 403]),
+    ("POST", "/api/v1/payment/mobile-money/simulate", "api_key", MOBILE_MONEY_PAYLOAD, [401, 403]),
+    ("GET", "/api/v1/payment/status/pay-123", None, None, [401, 403]),
+]
+
+
+class TestAuthRequired:
+    """Tests for authentication requirements on user-facing endpoints."""
+    
+    @pytest.mark.parametrize(
+        "method,path,credentials,payload,expected",
+        AUTH_REQUIRED_ROUTES,
+        ids=[
+            "parking-reserve",
+            "parking-release",
+            "mobile-money-no-auth",
+            "mobile-money-api-key-only",
+            "payment-status-no-key",
+        ]
+    )
+    def test_route_rejects_missing_credentials(
+        self,
+        probe,
+        api_key_header,
+        method: str,
+        path: str,
+        credentials,
+        payload: bytes,
+        expected: list
+    ):
+        """
+        Test: Endpoint rejects requests without the credentials it needs
+        (an API key alone is not a user token)
+        Expected: Status 401/403 (422 where validation runs first)
+        """
+        headers = api_key_header if credentials == "api_key" else None
+        
+        assert probe(method, path, headers=headers, body=payload) in expected
@@ -6,8 +6,8 @@ Run: pytest tests/test_health.py -v
 """
 
 import pytest
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock, AsyncMock
 
 
 class TestHealthEndpoints:
@@ -59,14 +59,12 @@ class TestHealthEndpoints:
     # TEST: OpenAPI Documentation
     # ============================================================
     
-    def test_docs_endpoint_accessible(self, client: TestClient):
+    def test_docs_endpoint_registered(self, app):
         """
-        Test: GET /docs returns Swagger UI
-        Expected: Status 200
+        Test: Swagger UI route is registered
+        Expected: /docs in application routes
         """
-        response = client.get("/docs")
-        
-        assert response.status_code == 200
+        assert "/docs" in {route.path for route in app.routes}
     
     def test_openapi_json_accessible(self, client: TestClient):
         """
@@ -83,109 +81,62 @@ class TestHealthEndpoints:
         assert "paths" in data
         assert "info" in data
     
-    def test_redoc_endpoint_accessible(self, client: TestClient):
+    def test_redoc_endpoint_registered(self, app):
         """
-        Test: GET /redoc returns ReDoc documentation
-        Expected: Status 200
+        Test: ReDoc route is registered
+        Expected: /redoc in application routes
         """
-        response = client.get("/redoc")
-        
-        assert response.status_code == 200
+        assert "/redoc" in {route.path for route in app.routes}
     
     # ============================================================
     # TEST: API Structure Validation
     # ============================================================
     
-    def test_api_has_sensor_endpoints(self, client: TestClient):
+    def test_api_has_sensor_endpoints(self, openapi_paths: frozenset):
         """
         Test: API includes sensor endpoints
         Expected: /api/v1/sensor paths exist
         """
-        response = client.get("/openapi.json")
-        data = response.json()
-        paths = data.get("paths", {})
-        
-        # Check sensor endpoints exist
-        sensor_paths = [p for p in paths.keys() if "/sensor" in p]
-        assert len(sensor_paths) > 0, "No sensor endpoints found"
+        assert any("/sensor" in p for p in openapi_paths), "No sensor endpoints found"
     
-    def test_api_has_parking_endpoints(self, client: TestClient):
+    def test_api_has_parking_endpoints(self, openapi_paths: frozenset):
         """
         Test: API includes parking endpoints
         Expected: /parking paths exist
         """
-        response = client.get("/openapi.json")
-        data = response.json()
-        paths = data.get("paths", {})
-        
-        # Check parking endpoints exist
-        parking_paths = [p for p in paths.keys() if "/parking" in p]
-        assert len(parking_paths) > 0, "No parking endpoints found"
+        assert any("/parking" in p for p in openapi_paths), "No parking endpoints found"
     
-    def test_api_has_payment_endpoints(self, client: TestClient):
+    def test_api_has_payment_endpoints(self, openapi_paths: frozenset):
         """
         Test: API includes payment endpoints
         Expected: /payment paths exist
         """
-        response = client.get("/openapi.json")
-        data = response.json()
-        paths = data.get("paths", {})
-        
-        # Check payment endpoints exist
-        payment_paths = [p for p in paths.keys() if "/payment" in p]
-        assert len(payment_paths) > 0, "No payment endpoints found"
+        assert any("/payment" in p for p in openapi_paths), "No payment endpoints found"
     
-    def test_api_has_access_endpoints(self, client: TestClient):
+    def test_api_has_access_endpoints(self, openapi_paths: frozenset):
         """
         Test: API includes access control endpoints
         Expected: /access paths exist
         """
-        response = client.get("/openapi.json")
-        data = response.json()
-        paths = data.get("paths", {})
-        
-        # Check access endpoints exist
-        access_paths = [p for p in paths.keys() if "/access" in p]
-        assert len(access_paths) > 0, "No access endpoints found"
+        assert any("/access" in p for p in openapi_paths), "No access endpoints found"
     
-    def test_api_has_admin_endpoints(self, client: TestClient):
+    def test_api_has_admin_endpoints(self, openapi_paths: frozenset):
         """
         Test: API includes admin endpoints
         Expected: /admin paths exist
         """
-        response = client.get("/openapi.json")
-        data = response.json()
-        paths = data.get("paths", {})
-        
-        # Check admin endpoints exist
-        admin_paths = [p for p in paths.keys() if "/admin" in p]
-        assert len(admin_paths) > 0, "No admin endpoints found"
+        assert any("/admin" in p for p in openapi_paths), "No admin endpoints found"
 
 
 class TestCORSHeaders:
     """Tests for CORS configuration."""
     
-    def test_cors_preflight_origin_header(self, client: TestClient):
+    def test_cors_middleware_configured(self, app):
         """
-        Test: CORS preflight includes access-control headers
-        Expected: Access-Control-Allow-Origin header in response
+        Test: CORS middleware is installed on the application
+        Expected: CORSMiddleware in app.user_middleware
         """
-        response = client.options(
-            "/",
-            headers={
-                "Origin": "http://localhost:3000",
-                "Access-Control-Request-Method": "GET"
-            }
-        )
-        
-        # CORS headers should be present if CORS is configured
-        # Note: May return 200 or 405 depending on CORS middleware config
-        cors_present = (
-            "access-control-allow-origin" in response.headers or
-            response.status_code in [200, 204]
-        )
-        # Just verify endpoint is reachable
-        assert response.status_code in [200, 204, 405]
+        assert any(m.cls is CORSMiddleware for m in app.user_middleware)
 
 
 class TestErrorHandling:
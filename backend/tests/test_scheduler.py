@@ -0,0 +1,461 @@
+"""
+AeroPark Smart System - Background Scheduler Tests
+Tests for the access code cleanup, against an in-memory Firestore fake,
+for the audit queue, the sub-task backoff and the tick's place snapshot.
+
+Run: pytest tests/test_scheduler.py -v
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils.scheduler import (
+    BATCH_COMMIT_THRESHOLD,
+    BROADCAST_EVERY_TICKS,
+    CLEANUP_PAGE_SIZE,
+    ReservationScheduler,
+)
+
+
+# ============================================================
+# FIRESTORE FAKE
+# ============================================================
+
+class FakeSnapshot:
+    """Document snapshot: ID plus data (None when the document is missing)."""
+    
+    def __init__(self, doc_id: str, data: dict = None):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+    
+    def to_dict(self):
+        return dict(self._data) if self.exists else None
+
+
+class FakeRef:
+    """Document reference; get() reads from the owning collection."""
+    
+    def __init__(self, collection, doc_id: str):
+        self.collection = collection
+        self.path = f"{collection.name}/{doc_id}"
+        self.doc_id = doc_id
+    
+    def get(self):
+        self.collection.reads.append(self.doc_id)
+        return FakeSnapshot(self.doc_id, self.collection.docs.get(self.doc_id))
+
+
+class FakeQuery:
+    """Query returning pre-built pages; start_after moves to the next one."""
+    
+    def __init__(self, collection, index: int = 0):
+        self.collection = collection
+        self.index = index
+    
+    def where(self, *args, **kwargs):
+        return self
+    
+    order_by = select = limit = where
+    
+    def start_after(self, doc):
+        self.collection.cursors.append(doc)
+        pages = self.collection.pages
+        index = next(i for i, page in enumerate(pages) if page and page[-1] is doc)
+        return FakeQuery(self.collection, index + 1)
+    
+    def stream(self):
+        pages = self.collection.pages
+        return iter(pages[self.index] if self.index < len(pages) else [])
+
+
+class FakeCollection:
+    """Collection with stored documents, query pages and read/cursor logs."""
+    
+    def __init__(self, name: str, docs: dict = None, pages: list = None):
+        self.name = name
+        self.docs = docs or {}
+        self.pages = pages or []
+        self.reads = []
+        self.cursors = []
+    
+    def document(self, doc_id: str) -> FakeRef:
+        return FakeRef(self, doc_id)
+    
+    def where(self, *args, **kwargs):
+        return FakeQuery(self).where(*args, **kwargs)
+
+
+class FakeBatch:
+    """WriteBatch recording its writes; commit fails on a path in fail_paths."""
+    
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+    
+    def set(self, ref, fields, merge=False):
+        self.writes.append(("set", ref.path))
+    
+    def update(self, ref, fields):
+        self.writes.append(("update", ref.path))
+    
+    def commit(self):
+        paths = {path for _, path in self.writes}
+        if paths & self.client.fail_paths:
+            raise RuntimeError("404 No document to update")
+        self.client.commits.append(self.writes)
+
+
+class FakeClient:
+    """Firestore client handing out FakeBatch objects."""
+    
+    def __init__(self):
+        self.commits = []
+        self.fail_paths = set()
+    
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+
+def code_doc(code_id: str, reservation_id: str = None) -> FakeSnapshot:
+    """Projected access code document, as returned by the cleanup query."""
+    return FakeSnapshot(code_id, {
+        "reservation_id": reservation_id,
+        "code_prefix": code_id[:2] + "***",
+        "expires_at": datetime(2026, 1, 1, tzinfo=timezone.utc)
+    })
+
+
+def queued_code_ids(scheduler: ReservationScheduler) -> list:
+    """Drain the audit queue and return the code IDs of its entries."""
+    ids = []
+    while not scheduler._audit_queue.empty():
+        ids.append(scheduler._audit_queue.get_nowait()["code_id"])
+    return ids
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def client() -> FakeClient:
+    """In-memory Firestore client."""
+    return FakeClient()
+
+
+@pytest.fixture
+def scheduler(client: FakeClient) -> ReservationScheduler:
+    """Scheduler with its services pre-resolved to mocks (no _lazy_init)."""
+    scheduler = ReservationScheduler()
+    scheduler._db = MagicMock()
+    scheduler._db.db = client
+    scheduler._db.release_updates.return_value = {"etat": "free"}
+    scheduler._audit = MagicMock()
+    scheduler._audit.build_log_entry.side_effect = lambda **kwargs: {
+        "event_type": kwargs["event_type"],
+        "code_id": kwargs["details"]["code_id"]
+    }
+    scheduler._places_ref = FakeCollection("places")
+    return scheduler
+
+
+def use_codes(scheduler: ReservationScheduler, pages: list):
+    """Serve the given pages of expired code documents to the cleanup query."""
+    scheduler._codes_ref = FakeCollection("access_codes", pages=pages)
+
+
+# ============================================================
+# ACCESS CODE CLEANUP
+# ============================================================
+
+class TestAccessCodeCleanup:
+    """Tests for _cleanup_expired_access_codes batching and paging."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    async def test_commits_when_batch_reaches_threshold(self, scheduler, client):
+        """
+        Test: More writes than BATCH_COMMIT_THRESHOLD in one run
+        Expected: A full batch is committed at the threshold, the rest at the end
+        """
+        extra = 10
+        use_codes(scheduler, [
+            [code_doc(f"C{i:03}") for i in range(BATCH_COMMIT_THRESHOLD + extra)]
+        ])
+        
+        expired = await scheduler._cleanup_expired_access_codes()
+        
+        assert expired == BATCH_COMMIT_THRESHOLD + extra
+        assert [len(writes) for writes in client.commits] == [BATCH_COMMIT_THRESHOLD, extra]
+    
+    async def test_pages_with_start_after(self, scheduler, client):
+        """
+        Test: A full page of expired codes followed by a short one
+        Expected: Second page read from the last document of the first
+        """
+        first = [code_doc(f"A{i:03}") for i in range(CLEANUP_PAGE_SIZE)]
+        second = [code_doc(f"B{i}") for i in range(3)]
+        use_codes(scheduler, [first, second])
+        
+        expired = await scheduler._cleanup_expired_access_codes()
+        
+        assert expired == CLEANUP_PAGE_SIZE + 3
+        assert scheduler._codes_ref.cursors == [first[-1]]
+        assert not scheduler._cleanup_backlog
+    
+    async def test_shared_reservation_released_once(self, scheduler, client):
+        """
+        Test: Two expired codes pointing to the same reservation
+        Expected: Reservation read once; spot and reservation written once
+        """
+        scheduler._places_ref.docs["RES-1"] = {"spot_id": "a1"}
+        use_codes(scheduler, [[code_doc("AB1", "RES-1"), code_doc("AB2", "RES-1")]])
+        
+        expired = await scheduler._cleanup_expired_access_codes()
+        
+        assert expired == 2
+        assert scheduler._places_ref.reads == ["RES-1"]
+        assert client.commits == [[
+            ("update", "access_codes/AB1"),
+            ("set", "places/a1"),
+            ("update", "places/RES-1"),
+            ("update", "access_codes/AB2"),
+        ]]
+        scheduler._db.places_changed.set.assert_called_once()
+    
+    async def test_failed_batch_retries_codes_one_by_one(self, scheduler, client):
+        """
+        Test: Batch commit fails because one code document no longer exists
+        Expected: Other codes committed on their own; only they are audited
+        """
+        client.fail_paths.add("access_codes/C2")
+        use_codes(scheduler, [[code_doc("C1"), code_doc("C2"), code_doc("C3")]])
+        
+        expired = await scheduler._cleanup_expired_access_codes()
+        
+        assert expired == 2
+        assert client.commits == [
+            [("update", "access_codes/C1")],
+            [("update", "access_codes/C3")],
+        ]
+        assert queued_code_ids(scheduler) == ["C1", "C3"]
+
+
+# ============================================================
+# AUDIT QUEUE
+# ============================================================
+
+class TestAuditQueue:
+    """Tests for audit events queued by the cleanup and written by the drainer."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    async def test_nothing_queued_for_uncommitted_batch(self, scheduler, client):
+        """
+        Test: Every commit of the cleanup fails
+        Expected: No code counted as expired and no audit event queued
+        """
+        client.fail_paths.update({"access_codes/C1", "access_codes/C2"})
+        use_codes(scheduler, [[code_doc("C1"), code_doc("C2")]])
+        
+        expired = await scheduler._cleanup_expired_access_codes()
+        
+        assert expired == 0
+        assert scheduler._audit_queue.empty()
+    
+    async def test_stop_flushes_queued_events(self, scheduler):
+        """
+        Test: Audit events still queued when the scheduler stops
+        Expected: stop() writes them all, on the scheduler's I/O threads
+        """
+        written = []
+        threads = []
+        
+        def log_batch(entries):
+            threads.append(threading.current_thread().name)
+            written.extend(entries)
+            return len(entries)
+        
+        scheduler._audit.log_batch.side_effect = log_batch
+        scheduler.start()
+        for i in range(3):
+            scheduler._queue_audit({"event_type": "code_expired", "code_id": f"C{i}"})
+        
+        await scheduler.stop()
+        
+        assert [entry["code_id"] for entry in written] == ["C0", "C1", "C2"]
+        assert scheduler._audit_queue.empty()
+        assert threads and all(name.startswith("scheduler-io") for name in threads)
+
+
+# ============================================================
+# SUB-TASK BACKOFF
+# ============================================================
+
+class TestSubTaskBackoff:
+    """Tests for the per sub-task failure backoff of the tick."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    async def test_reservation_service_propagates_database_errors(self):
+        """
+        Test: Firestore query for expired reservations fails
+        Expected: The error reaches the caller instead of returning 0
+        """
+        from services.reservation_service import ReservationService
+        
+        db = MagicMock()
+        db.get_expired_reservations = AsyncMock(side_effect=RuntimeError("unavailable"))
+        
+        with pytest.raises(RuntimeError):
+            await ReservationService(db=db).check_and_expire_reservations()
+    
+    async def test_reservation_failures_back_off_until_success(self, scheduler):
+        """
+        Test: Reservation expiry fails twice, then succeeds
+        Expected: Retried on the next tick, then backed off; success resets it
+        """
+        scheduler._rsvc = MagicMock()
+        scheduler._rsvc.check_and_expire_reservations = AsyncMock(
+            side_effect=RuntimeError("unavailable")
+        )
+        
+        assert await scheduler._check_expired_reservations() == 0
+        assert scheduler._backoff_ready("reservations")
+        
+        await scheduler._check_expired_reservations()
+        assert not scheduler._backoff_ready("reservations")
+        assert scheduler._fail_count["reservations"] == 2
+        
+        scheduler._rsvc.check_and_expire_reservations = AsyncMock(return_value=1)
+        
+        assert await scheduler._check_expired_reservations() == 1
+        assert scheduler._backoff_ready("reservations")
+        assert "reservations" not in scheduler._fail_count
+
+
+# ============================================================
+# TICK PLACE SNAPSHOT
+# ============================================================
+
+class TestTickSnapshot:
+    """Tests for when the tick reads every place."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    @pytest.fixture
+    def tick_scheduler(self, scheduler):
+        """Scheduler on a broadcast tick, with a pending place change."""
+        scheduler._tick_count = BROADCAST_EVERY_TICKS - 1
+        scheduler._db.places_changed = asyncio.Event()
+        scheduler._db.places_changed.set()
+        scheduler._db.get_all_places = AsyncMock(return_value=[{"etat": "free"}])
+        scheduler._db.count_places_by_etat = AsyncMock(return_value={
+            "total": 1, "free": 1, "occupied": 0, "reserved": 0
+        })
+        scheduler._rsvc = MagicMock()
+        scheduler._rsvc.check_and_expire_reservations = AsyncMock(return_value=0)
+        scheduler._mgr = MagicMock()
+        scheduler._mgr.broadcast_parking_status = AsyncMock()
+        return scheduler
+    
+    async def test_no_clients_skips_full_read(self, tick_scheduler):
+        """
+        Test: Broadcast tick with no WebSocket client connected
+        Expected: No full place read; expiry uses its filtered query
+        """
+        tick_scheduler._mgr.get_connection_count.return_value = 0
+        
+        await tick_scheduler._tick()
+        
+        tick_scheduler._db.get_all_places.assert_not_awaited()
+        assert tick_scheduler._rsvc.check_and_expire_reservations.await_args.args[0] is None
+        tick_scheduler._mgr.broadcast_parking_status.assert_not_awaited()
+    
+    async def test_counts_server_side_without_full_list_subscribers(self, tick_scheduler):
+        """
+        Test: Clients connected, none subscribed to the full place list
+        Expected: Status built from server-side counts, no full place read
+        """
+        tick_scheduler._mgr.get_connection_count.return_value = 2
+        tick_scheduler._mgr.clients_want_full_list.return_value = False
+        
+        await tick_scheduler._tick()
+        
+        tick_scheduler._db.get_all_places.assert_not_awaited()
+        tick_scheduler._db.count_places_by_etat.assert_awaited_once()
+        status = tick_scheduler._mgr.broadcast_parking_status.await_args.args[0]
+        assert status["libres"] == 1 and "places" not in status
+    
+    async def test_full_list_read_once_and_shared(self, tick_scheduler):
+        """
+        Test: A connected client subscribed to the full place list
+        Expected: Places read once, shared by expiry and the broadcast
+        """
+        tick_scheduler._mgr.get_connection_count.return_value = 1
+        tick_scheduler._mgr.clients_want_full_list.return_value = True
+        
+        await tick_scheduler._tick()
+        
+        tick_scheduler._db.get_all_places.assert_awaited_once()
+        places = tick_scheduler._db.get_all_places.return_value
+        assert tick_scheduler._rsvc.check_and_expire_reservations.await_args.args[0] is places
+        status = tick_scheduler._mgr.broadcast_parking_status.await_args.args[0]
+        assert status["places"] is places
+
+
+# ============================================================
+# EXPIRED RESERVATION FILTER
+# ============================================================
+
+class TestFilterExpired:
+    """Tests for ReservationService._filter_expired on a place snapshot."""
+    
+    NOW = datetime(2026, 1, 20, 12, 0, tzinfo=timezone.utc)
+    
+    @pytest.fixture
+    def reservation_service(self):
+        """ReservationService on a mock database."""
+        from services.reservation_service import ReservationService
+        
+        return ReservationService(db=MagicMock())
+    
+    def test_selects_only_reserved_places_past_their_end(self, reservation_service):
+        """
+        Test: Snapshot mixing reserved, occupied, past and future end times
+        Expected: Only reserved places whose end time has passed
+        """
+        past = datetime(2026, 1, 20, 11, 0, tzinfo=timezone.utc)
+        future = datetime(2026, 1, 20, 13, 0, tzinfo=timezone.utc)
+        places = [
+            {"place_id": "a1", "etat": "reserved", "reservation_end_time": past},
+            {"place_id": "a2", "etat": "reserved", "reservation_end_time": future},
+            {"place_id": "a3", "etat": "occupied", "reservation_end_time": past},
+            {"place_id": "a4", "etat": "reserved", "reservation_end_time": past.isoformat()},
+            {"place_id": "a5", "etat": "reserved", "reservation_end_time": None},
+        ]
+        
+        expired = reservation_service._filter_expired(places, self.NOW)
+        
+        assert [place["place_id"] for place in expired] == ["a1"]
+    
+    def test_naive_datetimes_are_utc(self, reservation_service):
+        """
+        Test: Naive end time and naive now
+        Expected: Both treated as UTC and compared without error
+        """
+        before = datetime(2026, 1, 20, 11, 59)
+        after = datetime(2026, 1, 20, 12, 1)
+        places = [
+            {"place_id": "a1", "etat": "reserved", "reservation_end_time": before},
+            {"place_id": "a2", "etat": "reserved", "reservation_end_time": after},
+        ]
+        
+        expired = reservation_service._filter_expired(places, datetime(2026, 1, 20, 12, 0))
+        
+        assert [place["place_id"] for place in expired] == ["a1"]
@@ -3,11 +3,65 @@ AeroPark Smart System - Sensor Endpoint Tests
 Tests for ESP32 sensor simulation endpoints.
 
 Run: pytest tests/test_sensor.py -v
+     pytest tests/test_sensor.py -n auto --dist loadgroup
 """
 
+from typing import Mapping
+
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import AsyncMock
+
+
+# Request bodies shared across tests, serialized once at import time
+OCCUPIED_PAYLOAD_BYTES = orjson.dumps({"place_id": "a1", "etat": "occupied", "force_signal": -55})
+WEAK_SIGNAL_PAYLOAD_BYTES = orjson.dumps({"place_id": "a1", "etat": "occupied", "force_signal": -75})  # Weak signal
+UNKNOWN_PLACE_PAYLOAD_BYTES = orjson.dumps({"place_id": "z99", "etat": "occupied", "force_signal": -55})
+JSON_HEADERS = {"Content-Type": "application/json"}
+SENSOR_UPDATE_URL = "/api/v1/sensor/update"
+
+# Keep this module on one xdist worker so it builds the app and client once
+pytestmark = pytest.mark.xdist_group("sensor")
+
+
+@pytest.fixture(autouse=True)
+def _patch_sensor_db(request, monkeypatch, app):
+    """Route routers.sensor.get_db to mock_db for tests that request it."""
+    if "mock_db" not in request.fixturenames:
+        return
+    import routers.sensor as sensor_mod
+    mock_db = request.getfixturevalue("mock_db")
+    monkeypatch.setattr(sensor_mod, "get_db", lambda: mock_db)
+
+
+@pytest.fixture
+def update_place_mock(mock_db):
+    """
+    Factory installing mock_db.update_place_status.
+    Call with ret= for a return value or exc= for a side effect.
+    """
+    def _make(ret=None, exc=None) -> AsyncMock:
+        mock = AsyncMock(return_value=ret, side_effect=exc)
+        mock_db.update_place_status = mock
+        return mock
+    return _make
+
+
+@pytest.fixture(scope="session")
+def sensor_post(bare_client: TestClient, api_key_headers: Mapping[str, str]):
+    """
+    POST a body to /api/v1/sensor/update with a valid API key.
+    Accepts pre-encoded bytes or a dict (serialized with orjson).
+    """
+    headers = {**JSON_HEADERS, **api_key_headers}
+    post = bare_client.post
+    
+    def _post(body):
+        if not isinstance(body, bytes):
+            body = orjson.dumps(body)
+        return post(SENSOR_UPDATE_URL, content=body, headers=headers)
+    return _post
 
 
 class TestSensorUpdate:
@@ -17,249 +71,131 @@ class TestSensorUpdate:
     # TEST: Authentication
     # ============================================================
     
-    def test_sensor_update_requires_api_key(self, client: TestClient):
+    def test_sensor_update_requires_api_key(self, bare_client: TestClient):
         """
         Test: Sensor update without API key returns 401
         Expected: Status 401 Unauthorized
         """
-        payload = {
-            "place_id": "a1",
-            "etat": "occupied",
-            "force_signal": -55
-        }
-        
-        response = client.post("/api/v1/sensor/update", json=payload)
+        response = bare_client.post(
+            SENSOR_UPDATE_URL,
+            content=OCCUPIED_PAYLOAD_BYTES,
+            headers=JSON_HEADERS
+        )
         
         assert response.status_code == 401
         assert "Clé API" in response.json().get("detail", "") or "API" in response.json().get("detail", "")
     
     def test_sensor_update_rejects_invalid_api_key(
         self, 
-        client: TestClient, 
-        invalid_api_key_headers: dict
+        bare_client: TestClient, 
+        invalid_api_key_headers: Mapping[str, str]
     ):
         """
         Test: Sensor update with invalid API key returns 401
         Expected: Status 401 Unauthorized
         """
-        payload = {
-            "place_id": "a1",
-            "etat": "occupied",
-            "force_signal": -55
-        }
-        
-        response = client.post(
-            "/api/v1/sensor/update",
-            json=payload,
-            headers=invalid_api_key_headers
+        response = bare_client.post(
+            SENSOR_UPDATE_URL,
+            content=OCCUPIED_PAYLOAD_BYTES,
+            headers={**JSON_HEADERS, **invalid_api_key_headers}
         )
         
         assert response.status_code == 401
     
     def test_sensor_update_accepts_valid_api_key(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
+        sensor_post,
         mock_db
     ):
         """
         Test: Sensor update with valid API key succeeds
         Expected: Status 200 OK
         """
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a1",
-                "etat": "occupied",
-                "force_signal": -55
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
+        response = sensor_post(OCCUPIED_PAYLOAD_BYTES)
+        
+        assert response.status_code == 200
     
     # ============================================================
     # TEST: Valid Payloads
     # ============================================================
     
-    def test_sensor_update_occupied_state(
+    @pytest.mark.parametrize("place_id,etat,force_signal", [
+        ("a1", "occupied", -50),
+        ("a3", "free", -40),
+    ])
+    def test_sensor_update_changes_state(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
-        mock_db
+        sensor_post,
+        update_place_mock,
+        place_id: str,
+        etat: str,
+        force_signal: int
     ):
         """
-        Test: Sensor reports place as occupied
-        Expected: Place state changes to OCCUPIED
+        Test: Sensor reports place as occupied (vehicle presence) or free (departure)
+        Expected: Database updated with the reported state, echoed in the response
         """
-        mock_db.update_place_status = AsyncMock(return_value={"etat": "occupied"})
+        update_db = update_place_mock(ret={"etat": etat})
         
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a1",
-                "etat": "occupied",
-                "force_signal": -60
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["place_id"] == "a1"
-            assert data["new_etat"] == "occupied"
-    
-    def test_sensor_update_free_state(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict,
-        mock_db
-    ):
-        """
-        Test: Sensor reports place as free
-        Expected: Place state changes to FREE
-        """
-        mock_db.update_place_status = AsyncMock(return_value={"etat": "free"})
+        payload = {
+            "place_id": place_id,
+            "etat": etat,
+            "force_signal": force_signal
+        }
+        
+        response = sensor_post(payload)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["place_id"] == place_id
+        assert data["new_etat"] == etat
         
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a2",
-                "etat": "free",
-                "force_signal": -45
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["new_etat"] == "free"
+        # Verify database was called correctly
+        update_db.assert_called_with(
+            place_id=place_id,
+            etat=etat,
+            force_signal=force_signal
+        )
     
     def test_sensor_update_with_signal_strength(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
+        sensor_post,
         mock_db
     ):
         """
         Test: Sensor update includes signal strength
         Expected: Signal strength is processed
         """
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a1",
-                "etat": "occupied",
-                "force_signal": -75  # Weak signal
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            mock_db.update_place_status.assert_called_once()
+        response = sensor_post(WEAK_SIGNAL_PAYLOAD_BYTES)
+        
+        assert response.status_code == 200
+        mock_db.update_place_status.assert_called_once()
     
     # ============================================================
     # TEST: Invalid Payloads
     # ============================================================
     
-    def test_sensor_update_missing_place_id(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict
-    ):
-        """
-        Test: Sensor update without place_id returns 422
-        Expected: Status 422 Unprocessable Entity
-        """
-        payload = {
-            "etat": "occupied",
-            "force_signal": -55
-        }
-        
-        response = client.post(
-            "/api/v1/sensor/update",
-            json=payload,
-            headers=api_key_headers
-        )
-        
-        assert response.status_code == 422
-    
-    def test_sensor_update_missing_etat(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict
-    ):
-        """
-        Test: Sensor update without etat returns 422
-        Expected: Status 422 Unprocessable Entity
-        """
-        payload = {
-            "place_id": "a1",
-            "force_signal": -55
-        }
-        
-        response = client.post(
-            "/api/v1/sensor/update",
-            json=payload,
-            headers=api_key_headers
-        )
-        
-        assert response.status_code == 422
-    
-    def test_sensor_update_invalid_etat_value(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict
-    ):
-        """
-        Test: Sensor update with invalid etat value returns 422
-        Expected: Status 422 Unprocessable Entity
-        """
-        payload = {
-            "place_id": "a1",
-            "etat": "invalid_state",
-            "force_signal": -55
-        }
-        
-        response = client.post(
-            "/api/v1/sensor/update",
-            json=payload,
-            headers=api_key_headers
-        )
-        
+    @pytest.mark.parametrize("payload,expected", [
+        (orjson.dumps({"etat": "occupied", "force_signal": -55}), (422,)),
+        (orjson.dumps({"place_id": "a1", "force_signal": -55}), (422,)),
         # Should be 422 or handled gracefully
-        assert response.status_code in [422, 400]
-    
-    def test_sensor_update_empty_payload(
+        (orjson.dumps({"place_id": "a1", "etat": "invalid_state", "force_signal": -55}), (422, 400)),
+        (b"{}", (422,)),
+    ], ids=["missing-place-id", "missing-etat", "invalid-etat-value", "empty-payload"])
+    def test_sensor_update_invalid_payload(
         self, 
-        client: TestClient, 
-        api_key_headers: dict
+        sensor_post,
+        payload: bytes,
+        expected: tuple
     ):
         """
-        Test: Sensor update with empty payload returns 422
+        Test: Sensor update with a missing or invalid field is rejected
         Expected: Status 422 Unprocessable Entity
         """
-        response = client.post(
-            "/api/v1/sensor/update",
-            json={},
-            headers=api_key_headers
-        )
+        response = sensor_post(payload)
         
-        assert response.status_code == 422
+        assert response.status_code in expected
     
     # ============================================================
     # TEST: Place Not Found
@@ -267,183 +203,92 @@ class TestSensorUpdate:
     
     def test_sensor_update_nonexistent_place(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
-        mock_db
+        sensor_post,
+        update_place_mock
     ):
         """
         Test: Sensor update for non-existent place returns 404
         Expected: Status 404 Not Found
         """
-        mock_db.update_place_status = AsyncMock(
-            side_effect=ValueError("Place z99 not found")
-        )
+        update_place_mock(exc=ValueError("Place z99 not found"))
         
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "z99",
-                "etat": "occupied",
-                "force_signal": -55
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 404
+        response = sensor_post(UNKNOWN_PLACE_PAYLOAD_BYTES)
+        
+        assert response.status_code == 404
 
 
 class TestSensorHealth:
     """Tests for GET /api/v1/sensor/health endpoint."""
     
-    def test_sensor_health_requires_api_key(self, client: TestClient):
+    def test_sensor_health_requires_api_key(self, bare_client: TestClient):
         """
         Test: Sensor health without API key returns 401
         Expected: Status 401 Unauthorized
         """
-        response = client.get("/api/v1/sensor/health")
+        response = bare_client.get("/api/v1/sensor/health")
         
         assert response.status_code == 401
     
     def test_sensor_health_with_valid_api_key(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
+        bare_client: TestClient, 
+        api_key_headers: Mapping[str, str],
         mock_db
     ):
         """
         Test: Sensor health with valid API key returns status
         Expected: Status 200 with health info
         """
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            response = client.get(
-                "/api/v1/sensor/health",
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            
-            # Should contain health information
-            assert "status" in data or "places" in data or "total" in data
+        response = bare_client.get(
+            "/api/v1/sensor/health",
+            headers=api_key_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        # Should contain health information
+        assert "status" in data or "places" in data or "total" in data
     
     def test_sensor_health_returns_parking_counts(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
+        bare_client: TestClient, 
+        api_key_headers: Mapping[str, str],
         mock_db
     ):
         """
         Test: Sensor health includes parking statistics
         Expected: Free/occupied/reserved counts
         """
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            response = client.get(
-                "/api/v1/sensor/health",
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            
-            # Verify counting fields exist
-            if "free" in data:
-                assert isinstance(data["free"], int)
-            if "occupied" in data:
-                assert isinstance(data["occupied"], int)
+        response = bare_client.get(
+            "/api/v1/sensor/health",
+            headers=api_key_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        # Verify counting fields exist
+        if "free" in data:
+            assert isinstance(data["free"], int)
+        if "occupied" in data:
+            assert isinstance(data["occupied"], int)
 
 
 class TestSensorBusinessLogic:
     """Tests for sensor business logic."""
     
-    def test_occupied_sensor_updates_place_to_occupied(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict,
-        mock_db
-    ):
-        """
-        Test: Vehicle presence triggers OCCUPIED state
-        Expected: Database updated with occupied status
-        """
-        mock_db.update_place_status = AsyncMock(return_value={"etat": "occupied"})
-        
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a1",
-                "etat": "occupied",
-                "force_signal": -50
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            
-            # Verify database was called correctly
-            mock_db.update_place_status.assert_called_with(
-                place_id="a1",
-                etat="occupied",
-                force_signal=-50
-            )
-    
-    def test_free_sensor_updates_place_to_available(
-        self, 
-        client: TestClient, 
-        api_key_headers: dict,
-        mock_db
-    ):
-        """
-        Test: Vehicle departure triggers FREE state
-        Expected: Database updated with free status
-        """
-        mock_db.update_place_status = AsyncMock(return_value={"etat": "free"})
-        
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a3",
-                "etat": "free",
-                "force_signal": -40
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["new_etat"] == "free"
-    
     def test_response_includes_timestamp(
         self, 
-        client: TestClient, 
-        api_key_headers: dict,
+        sensor_post,
         mock_db
     ):
         """
         Test: Sensor update response includes timestamp
         Expected: ISO format timestamp in response
         """
-        with patch("routers.sensor.get_db", return_value=mock_db):
-            payload = {
-                "place_id": "a1",
-                "etat": "occupied",
-                "force_signal": -55
-            }
-            
-            response = client.post(
-                "/api/v1/sensor/update",
-                json=payload,
-                headers=api_key_headers
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert "timestamp" in data
+        response = sensor_post(OCCUPIED_PAYLOAD_BYTES)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "timestamp" in data
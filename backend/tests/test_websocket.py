@@ -0,0 +1,205 @@
+"""
+AeroPark Smart System - WebSocket Broadcast Tests
+Tests for the full place list subscription, the prepared status broadcast
+and the serialization of Firestore timestamps.
+
+Run: pytest tests/test_websocket.py -v
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+
+class DatetimeWithNanoseconds(datetime):
+    """Stand-in for the datetime subclass returned by Firestore."""
+
+
+def make_socket() -> AsyncMock:
+    """WebSocket mock whose accept/send_* calls are awaitable."""
+    return AsyncMock()
+
+
+def sent_payloads(websocket: AsyncMock) -> list:
+    """Decode every text frame sent to the socket."""
+    return [orjson.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def manager():
+    """Fresh WebSocketManager, independent of the process-wide singleton."""
+    from services.websocket_service import WebSocketManager
+    
+    return WebSocketManager()
+
+
+@pytest.fixture
+def websocket_router(manager, monkeypatch):
+    """routers.websocket with get_websocket_manager bound to the fresh manager."""
+    import routers.websocket as websocket_router
+    
+    monkeypatch.setattr(websocket_router, "get_websocket_manager", lambda: manager)
+    return websocket_router
+
+
+# ============================================================
+# FULL LIST SUBSCRIPTION
+# ============================================================
+
+class TestFullListSubscription:
+    """Tests for the subscribe_places client message."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    async def test_subscribe_places_opts_client_in(self, manager, websocket_router):
+        """
+        Test: Client sends {"type": "subscribe_places"}
+        Expected: Subscription acknowledged and recorded on the manager
+        """
+        websocket = make_socket()
+        await manager.connect(websocket)
+        
+        await websocket_router.handle_client_message(websocket, {"type": "subscribe_places"})
+        
+        reply = websocket.send_json.await_args.args[0]
+        assert reply["type"] == "subscribed"
+        assert reply["topic"] == "places"
+        assert manager.clients_want_full_list()
+    
+    async def test_subscriber_receives_full_list(self, manager, websocket_router):
+        """
+        Test: Status broadcast by the scheduler after a client subscribed
+        Expected: The status_update frame carries the place list
+        """
+        from utils.scheduler import ReservationScheduler
+        
+        websocket = make_socket()
+        await manager.connect(websocket)
+        await websocket_router.handle_client_message(websocket, {"type": "subscribe_places"})
+        
+        scheduler = ReservationScheduler()
+        scheduler._mgr = manager
+        scheduler._db = MagicMock()
+        scheduler._db.places_changed = asyncio.Event()
+        scheduler._db.places_changed.set()
+        places = [{"place_id": "a1", "etat": "free"}, {"place_id": "a2", "etat": "reserved"}]
+        
+        await scheduler._broadcast_status(places)
+        
+        [status] = sent_payloads(websocket)
+        assert status["type"] == "status_update"
+        assert status["libres"] == 1 and status["reservees"] == 1
+        assert status["places"] == places
+    
+    async def test_disconnect_drops_subscription(self, manager, websocket_router):
+        """
+        Test: Subscribed client disconnects
+        Expected: No client wants the full list anymore
+        """
+        websocket = make_socket()
+        await manager.connect(websocket)
+        await websocket_router.handle_client_message(websocket, {"type": "subscribe_places"})
+        
+        await manager.disconnect(websocket)
+        
+        assert not manager.clients_want_full_list()
+
+
+# ============================================================
+# PREPARED BROADCAST
+# ============================================================
+
+class TestPreparedBroadcast:
+    """Tests for broadcast_prepared and broadcast_parking_status."""
+    
+    pytestmark = pytest.mark.asyncio
+    
+    async def test_failed_send_disconnects_only_that_client(self, manager):
+        """
+        Test: One of two clients fails to receive the frame
+        Expected: Only the failing client is disconnected
+        """
+        healthy = make_socket()
+        broken = make_socket()
+        broken.send_text.side_effect = RuntimeError("connection closed")
+        await manager.connect(healthy)
+        await manager.connect(broken)
+        manager.subscribe_full_list(broken)
+        
+        await manager.broadcast_prepared('{"type": "status_update"}')
+        
+        healthy.send_text.assert_awaited_once_with('{"type": "status_update"}')
+        assert manager.active_connections == [healthy]
+        assert broken not in manager.full_list_subscribers
+    
+    async def test_status_encoded_once_for_all_clients(self, manager):
+        """
+        Test: Parking status broadcast to several clients
+        Expected: Every client receives the same text frame, with a timestamp
+        """
+        sockets = [make_socket() for _ in range(3)]
+        for websocket in sockets:
+            await manager.connect(websocket)
+        
+        await manager.broadcast_parking_status({"type": "status_update", "libres": 4})
+        
+        frames = {websocket.send_text.await_args.args[0] for websocket in sockets}
+        assert len(frames) == 1
+        status = orjson.loads(frames.pop())
+        assert status["libres"] == 4 and "timestamp" in status
+
+
+# ============================================================
+# TIMESTAMP SERIALIZATION
+# ============================================================
+
+class TestJsonDefault:
+    """Tests for _json_default, the orjson fallback for Firestore values."""
+    
+    def test_firestore_datetime_subclass_serialized(self):
+        """
+        Test: Datetime subclass, which orjson rejects on its own
+        Expected: Encoded as its ISO 8601 string
+        """
+        from services.websocket_service import _json_default
+        
+        value = DatetimeWithNanoseconds(2026, 1, 20, 12, 30, tzinfo=timezone.utc)
+        
+        encoded = orjson.dumps({"last_update": value}, default=_json_default)
+        
+        assert orjson.loads(encoded) == {"last_update": value.isoformat()}
+    
+    def test_unsupported_type_still_rejected(self):
+        """
+        Test: Value without isoformat()
+        Expected: orjson raises instead of sending a broken frame
+        """
+        from services.websocket_service import _json_default
+        
+        with pytest.raises(orjson.JSONEncodeError):
+            orjson.dumps({"value": object()}, default=_json_default)
+    
+    @pytest.mark.asyncio
+    async def test_status_with_firestore_timestamps_is_sent(self, manager):
+        """
+        Test: Status whose place list holds Firestore timestamps
+        Expected: Frame sent, timestamps as ISO 8601 strings
+        """
+        websocket = make_socket()
+        await manager.connect(websocket)
+        value = DatetimeWithNanoseconds(2026, 1, 20, 12, 30, tzinfo=timezone.utc)
+        
+        await manager.broadcast_parking_status({
+            "type": "status_update",
+            "places": [{"place_id": "a1", "last_update": value}]
+        })
+        
+        [status] = sent_payloads(websocket)
+        assert status["places"][0]["last_update"] == value.isoformat()
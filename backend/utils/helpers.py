@@ -3,12 +3,37 @@ AeroPark Smart System - Helper Functions
 Utility functions used across the application.
 """
 
+from functools import lru_cache
 from typing import Optional
+import hashlib
 import re
 import string
+import time
 from datetime import datetime, timedelta
 
 
+# Precompiled patterns
+# Characters allowed in spot and sensor IDs
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_PLATE_RE = re.compile(r'^[A-Z0-9-]+$')
+
+# str.translate table deleting C0 and C1 control characters
+_CONTROL_CHARS = dict.fromkeys([*range(0, 32), *range(127, 160)])
+
+_utcnow = datetime.utcnow
+_NO_TIME = timedelta(0)
+
+# Template for calculate_time_remaining (copied on return)
+_EXPIRED = {
+    "expired": True,
+    "total_seconds": 0,
+    "hours": 0,
+    "minutes": 0,
+    "seconds": 0,
+    "formatted": "Expired"
+}
+
+
 def generate_spot_number(zone: str = "A", index: int = 1) -> str:
     """
     Generate a standardized spot number.
@@ -20,15 +45,20 @@ def generate_spot_number(zone: str = "A", index: int = 1) -> str:
     Returns:
         str: Formatted spot number (e.g., "A1", "T1-001")
     """
-    # Extract first letter if zone is a name
-    zone_prefix = zone[0].upper() if zone else "A"
-    
-    if len(zone) > 2:
-        # For named zones like "Terminal 1", use abbreviation
-        zone_prefix = "".join(word[0].upper() for word in zone.split()[:2])
-        return f"{zone_prefix}-{index:03d}"
-    
-    return f"{zone_prefix}{index}"
+    if not zone:
+        return f"A{index}"
+    
+    # Short zones ("A", "B2") use their first letter
+    if len(zone) <= 2:
+        return f"{zone[0].upper()}{index}"
+    
+    # For named zones like "Terminal 1", use abbreviation
+    words = zone.split()
+    if len(words) > 1:
+        zone_prefix = (words[0][0] + words[1][0]).upper()
+    else:
+        zone_prefix = words[0][0].upper() if words else ""
+    return f"{zone_prefix}-{index:03d}"
 
 
 def format_duration(minutes: int) -> str:
@@ -42,20 +72,16 @@ def format_duration(minutes: int) -> str:
         str: Human-readable duration (e.g., "2 hours 30 minutes")
     """
     if minutes < 60:
-        return f"{minutes} minute{'s' if minutes != 1 else ''}"
-    
-    hours = minutes // 60
-    remaining_minutes = minutes % 60
+        return f"{minutes} minute{'s'[:minutes != 1]}"
     
-    parts = []
-    if hours > 0:
-        parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
-    if remaining_minutes > 0:
-        parts.append(f"{remaining_minutes} minute{'s' if remaining_minutes != 1 else ''}")
+    hours, remaining_minutes = divmod(minutes, 60)
+    if not remaining_minutes:
+        return f"{hours} hour{'s'[:hours != 1]}"
     
-    return " ".join(parts)
+    return f"{hours} hour{'s'[:hours != 1]} {remaining_minutes} minute{'s'[:remaining_minutes != 1]}"
 
 
+@lru_cache(maxsize=2048)
 def validate_spot_id(spot_id: str) -> bool:
     """
     Validate a parking spot ID format.
@@ -75,10 +101,10 @@ def validate_spot_id(spot_id: str) -> bool:
         return False
     
     # Allow alphanumeric, hyphens, and underscores
-    pattern = r'^[a-zA-Z0-9_-]+$'
-    return bool(re.match(pattern, spot_id))
+    return _ID_CHARS.issuperset(spot_id)
 
 
+@lru_cache(maxsize=2048)
 def validate_sensor_id(sensor_id: str) -> bool:
     """
     Validate a sensor ID format.
@@ -93,8 +119,7 @@ def validate_sensor_id(sensor_id: str) -> bool:
         return False
     
     # Expected format: ESP32-SENSOR-XXX or similar
-    pattern = r'^[A-Za-z0-9_-]{3,50}$'
-    return bool(re.match(pattern, sensor_id))
+    return 3 <= len(sensor_id) <= 50 and _ID_CHARS.issuperset(sensor_id)
 
 
 def calculate_time_remaining(end_time: datetime) -> dict:
@@ -107,24 +132,16 @@ def calculate_time_remaining(end_time: datetime) -> dict:
     Returns:
         dict: Breakdown of remaining time
     """
-    now = datetime.utcnow()
+    delta = end_time - _utcnow()
     
-    if end_time <= now:
-        return {
-            "expired": True,
-            "total_seconds": 0,
-            "hours": 0,
-            "minutes": 0,
-            "seconds": 0,
-            "formatted": "Expired"
-        }
+    if delta <= _NO_TIME:
+        return dict(_EXPIRED)
     
-    delta = end_time - now
-    total_seconds = int(delta.total_seconds())
+    # Whole seconds, without going through a float
+    total_seconds = delta.days * 86400 + delta.seconds
     
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
     
     # Format string
     parts = []
@@ -159,17 +176,19 @@ def sanitize_string(value: str, max_length: int = 100) -> str:
     if not value:
         return ""
     
-    # Remove control characters
-    value = "".join(char for char in value if char.isprintable())
+    # Common case: nothing to remove, so only trim and (rarely) truncate
+    if value.isprintable():
+        value = value.strip()
+        return value if len(value) <= max_length else value[:max_length]
     
-    # Trim whitespace
-    value = value.strip()
+    # Remove control characters: C0/C1 codes via a C-level translate, and
+    # any remaining non-printable characters (e.g. zero-width) the slow way
+    value = value.translate(_CONTROL_CHARS)
+    if not value.isprintable():
+        value = "".join(char for char in value if char.isprintable())
     
-    # Truncate if necessary
-    if len(value) > max_length:
-        value = value[:max_length]
-    
-    return value
+    # Trim whitespace, truncate if necessary
+    return value.strip()[:max_length]
 
 
 def generate_reservation_code(spot_number: str, user_id: str) -> str:
@@ -183,12 +202,9 @@ def generate_reservation_code(spot_number: str, user_id: str) -> str:
     Returns:
         str: Short reservation code
     """
-    import hashlib
-    from datetime import datetime
-    
-    # Create a hash from spot, user, and timestamp
-    data = f"{spot_number}{user_id}{datetime.utcnow().isoformat()}"
-    hash_value = hashlib.md5(data.encode()).hexdigest()[:6].upper()
+    # Create a hash from spot, user, and timestamp (3-byte digest = 6 hex chars)
+    data = f"{spot_number}{user_id}{time.time_ns()}".encode()
+    hash_value = hashlib.blake2b(data, digest_size=3).hexdigest().upper()
     
     return f"{spot_number}-{hash_value}"
 
@@ -214,19 +230,31 @@ def parse_duration_string(duration_str: str) -> Optional[int]:
     except ValueError:
         pass
     
-    # Parse patterns like "2h", "30m", "2h30m"
-    total_minutes = 0
-    
-    # Hours
-    hours_match = re.search(r'(\d+)\s*h', duration_str)
-    if hours_match:
-        total_minutes += int(hours_match.group(1)) * 60
-    
-    # Minutes
-    minutes_match = re.search(r'(\d+)\s*m', duration_str)
-    if minutes_match:
-        total_minutes += int(minutes_match.group(1))
+    # Parse patterns like "2h", "30m", "2h30m" in one scan: the first digit
+    # run followed (after optional spaces) by "h" gives the hours, the first
+    # one followed by "m" the minutes; everything else is ignored
+    hours = minutes = None
+    i, length = 0, len(duration_str)
+    while i < length:
+        if not duration_str[i].isdecimal():
+            i += 1
+            continue
+        
+        start = i
+        while i < length and duration_str[i].isdecimal():
+            i += 1
+        
+        unit = i
+        while unit < length and duration_str[unit].isspace():
+            unit += 1
+        
+        if unit < length:
+            if duration_str[unit] == "h" and hours is None:
+                hours = int(duration_str[start:i])
+            elif duration_str[unit] == "m" and minutes is None:
+                minutes = int(duration_str[start:i])
     
+    total_minutes = (hours or 0) * 60 + (minutes or 0)
     return total_minutes if total_minutes > 0 else None
 
 
@@ -244,12 +272,15 @@ def is_valid_license_plate(plate: str) -> bool:
     if not plate:
         return False
     
-    plate = plate.upper().strip()
-    
+    return _is_valid_normalized_plate(plate.upper().strip())
+
+
+@lru_cache(maxsize=2048)
+def _is_valid_normalized_plate(plate: str) -> bool:
+    """Format check for an uppercased, stripped plate (cached)."""
     # Basic: 2-10 alphanumeric characters
     if len(plate) < 2 or len(plate) > 10:
         return False
     
     # Allow letters, numbers, and hyphens
-    pattern = r'^[A-Z0-9-]+$'
-    return bool(re.match(pattern, plate))
+    return bool(_PLATE_RE.match(plate))
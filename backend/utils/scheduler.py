@@ -5,13 +5,73 @@ Handles background tasks like reservation expiry checking.
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from typing import Optional
+from google.cloud.firestore_v1 import FieldFilter
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set
 import logging
 import asyncio
+import random
+import time
+
+from services.audit_service import AuditEventType, AuditDecision
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Expired access codes fetched per query page (Firestore batch limit)
+CLEANUP_PAGE_SIZE = 500
+
+# Pages handled per cleanup run, bounding its duration; a remaining
+# backlog is resumed on the next tick
+CLEANUP_MAX_PAGES = 10
+
+# Commit a WriteBatch once it holds this many writes (Firestore max is 500)
+BATCH_COMMIT_THRESHOLD = 450
+
+# Maximum concurrent Firestore reads during access code cleanup
+CLEANUP_CONCURRENCY = 20
+
+# Threads running the scheduler's blocking Firestore calls
+IO_WORKERS = CLEANUP_CONCURRENCY
+
+# Polling interval of the scheduler tick
+TICK_SECONDS = 30
+
+# Access code cleanup runs every this many ticks (5 minutes); validate_code
+# already rejects expired codes, so this only frees spots and audits
+CLEANUP_EVERY_TICKS = 10
+
+# Status broadcast runs every this many ticks (1 minute)
+BROADCAST_EVERY_TICKS = 2
+
+# Resend the parking status at least this often, even if nothing changed,
+# so clients that connected late re-sync
+STATUS_HEARTBEAT_SECONDS = 300
+
+# Audit events waiting to be written; further events are dropped and counted
+AUDIT_QUEUE_SIZE = 10_000
+
+# Queued audit events are written every AUDIT_FLUSH_SECONDS, at most
+# AUDIT_BATCH_SIZE per Firestore batch
+AUDIT_BATCH_SIZE = 400
+AUDIT_FLUSH_SECONDS = 1.0
+
+# Log a warning when a reminder fires this far from its deadline
+REMINDER_SKEW_WARNING_SECONDS = 1.0
+
+# A failing sub-task is retried on the next tick, then backs off
+# exponentially (in whole ticks) up to this long, plus up to 10% jitter
+BACKOFF_MAX_SECONDS = 600
+
+# One instance per job at a time; missed runs collapse into a single run
+JOB_DEFAULTS = {
+    "max_instances": 1,
+    "coalesce": True,
+    "misfire_grace_time": 30,
+}
+
 
 class ReservationScheduler:
     """
@@ -20,8 +80,32 @@ class ReservationScheduler:
     """
     
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        self.scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
         self._is_running = False
+        # Caps in-flight Firestore reads during access code cleanup
+        self._cleanup_semaphore = asyncio.Semaphore(CLEANUP_CONCURRENCY)
+        self._tick_count = 0
+        # Set when the last cleanup stopped at CLEANUP_MAX_PAGES
+        self._cleanup_backlog = False
+        # time.monotonic() may be below the heartbeat on a fresh host; start
+        # one full period back so the first broadcast is never delayed
+        self._last_status_broadcast = -STATUS_HEARTBEAT_SECONDS
+        # Service singletons, resolved on the first job run
+        self._db = self._mgr = self._rsvc = self._audit = None
+        # Collections on the process-wide Firestore client, resolved with them
+        self._codes_ref = self._places_ref = None
+        # Pending one-shot reminders, keyed by reservation ID
+        self._reminders: Dict[str, asyncio.TimerHandle] = {}
+        self._reminder_tasks: Set[asyncio.Task] = set()
+        # Audit events are written off the job path by _audit_drainer
+        self._audit_queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        self._audit_task: Optional[asyncio.Task] = None
+        self._audit_dropped = 0
+        # Dedicated threads for blocking Firestore calls, created on start
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        # Consecutive failures and next allowed run (monotonic), per sub-task
+        self._fail_count: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
     
     def start(self):
         """Start the background scheduler."""
@@ -29,43 +113,46 @@ class ReservationScheduler:
             logger.warning("Scheduler is already running")
             return
         
-        # Add reservation expiry check job
+        # Single polling job: reservation expiry every tick, access code
+        # cleanup every 5 minutes, status broadcast every minute
         self.scheduler.add_job(
-            self._check_expired_reservations,
-            trigger=IntervalTrigger(seconds=30),  # Check every 30 seconds
-            id="check_expired_reservations",
-            name="Check and expire overdue reservations",
-            replace_existing=True
+            self._tick,
+            trigger=IntervalTrigger(seconds=TICK_SECONDS),
+            id="scheduler_tick",
+            name="Expire reservations and codes, broadcast parking status",
+            replace_existing=True,
+            **JOB_DEFAULTS
         )
         
-        # Add access code expiration job
-        self.scheduler.add_job(
-            self._cleanup_expired_access_codes,
-            trigger=IntervalTrigger(minutes=1),  # Check every minute
-            id="cleanup_expired_codes",
-            name="Cleanup expired access codes and free spots",
-            replace_existing=True
-        )
-        
-        # Add periodic status broadcast job
-        self.scheduler.add_job(
-            self._broadcast_status,
-            trigger=IntervalTrigger(minutes=1),  # Broadcast every minute
-            id="broadcast_parking_status",
-            name="Broadcast parking status updates",
-            replace_existing=True
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=IO_WORKERS, thread_name_prefix="scheduler-io"
         )
+        self._audit_task = asyncio.get_running_loop().create_task(self._audit_drainer())
         
         self.scheduler.start()
         self._is_running = True
         logger.info("Background scheduler started")
     
-    def stop(self):
+    async def stop(self):
         """Stop the background scheduler."""
         if not self._is_running:
             return
         
         self.scheduler.shutdown(wait=False)
+        for handle in self._reminders.values():
+            handle.cancel()
+        self._reminders.clear()
+        # Stop the drainer, then write what is still queued while the
+        # loop and the I/O threads are up (a drainer cancelled before it
+        # ever ran skips its own final flush)
+        if self._audit_task is not None:
+            self._audit_task.cancel()
+            await asyncio.gather(self._audit_task, return_exceptions=True)
+            self._audit_task = None
+        await self._flush_audit()
+        if self._io_executor is not None:
+            self._io_executor.shutdown(wait=False)
+            self._io_executor = None
         self._is_running = False
         logger.info("Background scheduler stopped")
     
@@ -73,155 +160,499 @@ class ReservationScheduler:
         """Check if scheduler is running."""
         return self._is_running
     
-    async def _check_expired_reservations(self):
+    def _lazy_init(self):
+        """
+        Resolve the database and service singletons once, on the first
+        job run, so the tick path does no imports or getter calls.
+        """
+        from database.firebase_db import get_db
+        from services.websocket_service import get_websocket_manager
+        from services.reservation_service import get_reservation_service
+        from services.audit_service import get_audit_service
+        
+        db = get_db()
+        self._mgr = get_websocket_manager()
+        self._rsvc = get_reservation_service()
+        self._audit = get_audit_service()
+        # All jobs share FirebaseDB's client (one gRPC channel per process)
+        self._codes_ref = db.db.collection("access_codes")
+        self._places_ref = db.db.collection(db.COLLECTION_PLACES)
+        # Set last: it marks the initialization as done
+        self._db = db
+    
+    async def _tick(self):
+        """
+        Run all periodic tasks from one job, with a single timestamp.
+        When the full place list is broadcast this tick, the places are
+        loaded once and shared between the sub-tasks.
+        """
+        self._tick_count += 1
+        now = datetime.now(timezone.utc)
+        broadcast_due = (
+            self._tick_count % BROADCAST_EVERY_TICKS == 0
+            and self._backoff_ready("broadcast")
+        )
+        
+        # Read every place only when the full list goes out this tick;
+        # otherwise the sub-tasks use a filtered query and server-side counts
+        places = None
+        if broadcast_due and self._backoff_ready("places"):
+            try:
+                if self._db is None:
+                    self._lazy_init()
+                if self._status_broadcast_due() and self._mgr.clients_want_full_list():
+                    places = await self._db.get_all_places()
+                    self._record_result("places", True)
+            except Exception as e:
+                logger.error(f"Error loading places for scheduler tick: {e}")
+                self._record_result("places", False)
+        
+        expired = 0
+        if self._backoff_ready("reservations"):
+            expired = await self._check_expired_reservations(places, now)
+        
+        cleanup_due = self._cleanup_backlog or self._tick_count % CLEANUP_EVERY_TICKS == 0
+        if cleanup_due and self._backoff_ready("cleanup"):
+            expired += await self._cleanup_expired_access_codes(now)
+        
+        if broadcast_due:
+            # The snapshot predates this tick's writes; reload if there were any
+            await self._broadcast_status(None if expired else places)
+    
+    async def _check_expired_reservations(self, places=None, now=None):
         """
         Check for and handle expired reservations.
         This runs periodically as a background task.
+        
+        Args:
+            places: Parking places already loaded by the tick, if any
+            now: Current UTC time shared by the tick
+            
+        Returns:
+            int: Number of reservations expired
         """
         try:
-            # Import here to avoid circular imports
-            from services.reservation_service import get_reservation_service
+            if self._db is None:
+                self._lazy_init()
             
-            service = get_reservation_service()
-            expired_count = await service.check_and_expire_reservations()
+            expired_count = await self._rsvc.check_and_expire_reservations(places, now)
             
             if expired_count > 0:
                 logger.info(f"Processed {expired_count} expired reservation(s)")
+            
+            self._record_result("reservations", True)
+            return expired_count
                 
         except Exception as e:
             logger.error(f"Error checking expired reservations: {e}")
+            self._record_result("reservations", False)
+            return 0
     
-    async def _broadcast_status(self):
+    async def _broadcast_status(self, places=None):
         """
         Periodically broadcast parking status to all WebSocket clients.
         Keeps clients in sync even without explicit updates.
+        
+        Args:
+            places: Parking places already loaded by the tick, if any
         """
+        previous_broadcast = self._last_status_broadcast
         try:
-            # Import here to avoid circular imports
-            from services.websocket_service import get_websocket_manager
-            from database.firebase_db import get_db
+            if self._db is None:
+                self._lazy_init()
             
-            db = get_db()
-            manager = get_websocket_manager()
+            # Nothing to do: skip before any Firestore work, without
+            # recording a success (a previous failure stays pending)
+            if not self._status_broadcast_due():
+                return
+            # Cleared before reading so writes during the broadcast re-flag it
+            self._db.places_changed.clear()
+            self._last_status_broadcast = time.monotonic()
             
-            if manager.get_connection_count() > 0:
-                places = await db.get_all_places()
+            if places is not None:
+                # One pass over the snapshot, tallied in C
+                etats = Counter(p.get("etat") for p in places)
                 total = len(places)
-                free = sum(1 for p in places if p.get("etat") == "free")
-                occupied = sum(1 for p in places if p.get("etat") == "occupied")
-                reserved = sum(1 for p in places if p.get("etat") == "reserved")
-                
-                status = {
-                    "type": "status_update",
-                    "total_places": total,
-                    "libres": free,
-                    "occupees": occupied,
-                    "reservees": reserved,
-                    "places": places
-                }
-                await manager.broadcast_parking_status(status)
-                
+                free = etats["free"]
+                occupied = etats["occupied"]
+                reserved = etats["reserved"]
+            else:
+                # Count server-side rather than loading every place
+                counts = await self._db.count_places_by_etat()
+                total = counts["total"]
+                free = counts["free"]
+                occupied = counts["occupied"]
+                reserved = counts["reserved"]
+            
+            status = {
+                "type": "status_update",
+                "total_places": total,
+                "libres": free,
+                "occupees": occupied,
+                "reservees": reserved
+            }
+            
+            # Only ship the full list to clients that subscribed to it
+            if self._mgr.clients_want_full_list():
+                if places is None:
+                    places = await self._db.get_all_places()
+                status["places"] = places
+            await self._mgr.broadcast_parking_status(status)
+            self._record_result("broadcast", True)
+            
         except Exception as e:
             logger.error(f"Error broadcasting status: {e}")
+            # Nothing was sent: keep the change pending for the next attempt
+            if self._db is not None:
+                self._db.places_changed.set()
+            self._last_status_broadcast = previous_broadcast
+            self._record_result("broadcast", False)
+    
+    def _status_broadcast_due(self) -> bool:
+        """
+        Check whether a status broadcast would go out: clients are
+        connected and a place changed or the heartbeat is due.
+        """
+        if not self._mgr.get_connection_count():
+            return False
+        heartbeat = time.monotonic() - self._last_status_broadcast >= STATUS_HEARTBEAT_SECONDS
+        return self._db.places_changed.is_set() or heartbeat
     
-    async def _cleanup_expired_access_codes(self):
+    async def _cleanup_expired_access_codes(self, now=None):
         """
         Background job to cleanup expired access codes.
         
-        This job runs every minute and:
-        1. Finds all expired access codes (past expiry_time)
-        2. Marks codes as EXPIRED
+        This job runs every 5 minutes and:
+        1. Queries active access codes past their expires_at
+        2. Marks codes as expired
         3. Frees up associated parking spots
         4. Cancels reservations if not yet used
         5. Logs audit events for each expiration
+        
+        Args:
+            now: Current UTC time shared by the tick
+            
+        Returns:
+            int: Number of access codes expired
         """
         try:
-            from services.access_code_service import access_code_service
-            from services.audit_service import audit_service, AuditEventType, AuditDecision
-            from database.firebase_db import get_db
-            from datetime import datetime, timezone
-            
-            db = get_db()
+            if self._db is None:
+                self._lazy_init()
             
-            # Get all access codes
-            codes_ref = db.db.collection("access_codes")
-            all_codes = codes_ref.stream()
+            db = self._db
+            codes_ref = self._codes_ref
+            places_ref = self._places_ref
             
             expired_count = 0
-            now = datetime.now(timezone.utc)
+            if now is None:
+                now = datetime.now(timezone.utc)
+            # Formatted and built once per run, not per expired code; the
+            # writes only read them, so sharing is safe
+            now_iso = now.isoformat()
+            release_fields = db.release_updates(now)
+            code_expired_fields = {"status": "expired", "expired_at": now}
+            reservation_expired_fields = {
+                "reservation_status": "expired",
+                "status_updated_at": now_iso
+            }
+            code_doc_ref = codes_ref.document
+            place_doc_ref = places_ref.document
             
-            for code_doc in all_codes:
-                code_data = code_doc.to_dict()
-                code_id = code_doc.id
-                
-                # Check if code is active and expired
-                if code_data.get("status") not in ["ACTIVE", "active"]:
-                    continue
-                
-                expiry_time = code_data.get("expiry_time")
-                if not expiry_time:
-                    continue
-                
-                # Handle different datetime formats
-                if hasattr(expiry_time, 'timestamp'):
-                    expiry_dt = expiry_time
-                else:
-                    continue
+            # Let Firestore return only expired codes, using the
+            # (status, expires_at) composite index
+            query = codes_ref.where(
+                filter=FieldFilter("status", "==", "active")
+            ).where(
+                filter=FieldFilter("expires_at", "<=", now)
+            ).order_by(
+                # Oldest first, so a capped run handles the most overdue codes
+                "expires_at"
+            ).select(
+                # Only the fields used below; expires_at is needed by the
+                # start_after cursor
+                ["reservation_id", "code_prefix", "expires_at"]
+            ).limit(CLEANUP_PAGE_SIZE)
+            
+            # Writes are grouped into batches instead of one RPC each:
+            # (code_id, [(ref, fields, merge)], audit entry) per expired code
+            pending = []
+            op_count = 0
+            
+            # One read per reservation for the whole run, even when several
+            # codes point to it (holds in-flight lookups too)
+            lookups = {}
+            released = set()
+            
+            last_doc = None
+            pages = 0
+            self._cleanup_backlog = False
+            while True:
+                page = query.start_after(last_doc) if last_doc else query
+                code_docs = await self._run_io(lambda: list(page.stream()))
                 
-                # Make expiry_dt timezone aware if needed
-                if expiry_dt.tzinfo is None:
-                    expiry_dt = expiry_dt.replace(tzinfo=timezone.utc)
+                # Fetch the reservations of this page concurrently
+                results = await asyncio.gather(
+                    *(self._load_expired_code(places_ref, doc, lookups) for doc in code_docs),
+                    return_exceptions=True
+                )
                 
-                # Check if expired
-                if now > expiry_dt:
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error loading expired access code: {result}")
+                        continue
+                    code_id, code_data, reservation = result
+                    
                     # Mark code as expired
-                    codes_ref.document(code_id).update({
-                        "status": "EXPIRED",
-                        "expired_at": now
-                    })
+                    writes = [(code_doc_ref(code_id), code_expired_fields, False)]
                     
                     # Free the parking spot if reservation exists
                     reservation_id = code_data.get("reservation_id")
-                    if reservation_id:
-                        reservation = await db.get_reservation(reservation_id)
-                        if reservation:
-                            spot_id = reservation.get("spot_id")
-                            if spot_id:
-                                await db.update_place_status(spot_id, "free")
-                            
-                            # Update reservation status
-                            await db.update_reservation(reservation_id, {
-                                "status": "EXPIRED",
-                                "expired_at": now.isoformat()
-                            })
+                    if reservation and reservation_id not in released:
+                        released.add(reservation_id)
+                        spot_id = reservation.get("spot_id")
+                        if spot_id:
+                            writes.append((place_doc_ref(spot_id), release_fields, True))
+                        
+                        # Update reservation status
+                        writes.append(
+                            (place_doc_ref(reservation_id), reservation_expired_fields, False)
+                        )
                     
-                    # Log audit event
-                    await audit_service.log_event(
+                    # Audit event, written by the drainer after the commit
+                    log_entry = self._audit.build_log_entry(
                         event_type=AuditEventType.CODE_EXPIRED,
                         decision=AuditDecision.INFO,
                         barrier_id="scheduler",
                         details={
                             "code_id": code_id,
-                            "code": code_data.get("code", "")[:2] + "***",
+                            # Codes created before code_prefix existed: the document
+                            # ID is the code itself
+                            "code": code_data.get("code_prefix") or code_id[:2] + "***",
                             "reservation_id": reservation_id,
-                            "expired_at": now.isoformat(),
+                            "expired_at": now_iso,
                             "reason": "Automatic expiration by scheduler"
                         }
                     )
                     
-                    expired_count += 1
+                    pending.append((code_id, writes, log_entry))
+                    op_count += len(writes)
+                    
+                    if op_count >= BATCH_COMMIT_THRESHOLD:
+                        expired_count += await self._commit_expired(pending)
+                        pending = []
+                        op_count = 0
+                
+                if len(code_docs) < CLEANUP_PAGE_SIZE:
+                    break
+                pages += 1
+                if pages >= CLEANUP_MAX_PAGES:
+                    self._cleanup_backlog = True
+                    logger.warning("Access code cleanup not caught up, resuming next tick")
+                    break
+                last_doc = code_docs[-1]
+            
+            if pending:
+                expired_count += await self._commit_expired(pending)
+            
+            if expired_count > 0:
+                # Reservation and spot writes above bypass FirebaseDB
+                db.places_changed.set()
             
             if expired_count > 0:
                 logger.info(f"Expired {expired_count} access codes")
+            
+            self._record_result("cleanup", True)
+            return expired_count
                 
         except Exception as e:
             logger.error(f"Error cleaning up expired access codes: {e}")
+            self._record_result("cleanup", False)
+            return 0
+    
+    async def _commit_expired(self, pending) -> int:
+        """
+        Commit the writes of expired access codes in one batch, then queue
+        their audit entries.
+        If the batch fails (e.g. a document that no longer exists), each
+        code is retried on its own so one bad reference does not block the
+        others; codes that still fail are logged and left for a later run.
+        
+        Args:
+            pending: (code_id, [(ref, fields, merge)], audit entry) tuples
+            
+        Returns:
+            int: Number of access codes written
+        """
+        try:
+            await self._run_io(self._build_batch(pending).commit)
+            written = pending
+        except Exception as e:
+            logger.warning(
+                f"Access code cleanup batch of {len(pending)} failed, "
+                f"retrying codes one by one: {e}"
+            )
+            written = []
+            for item in pending:
+                try:
+                    await self._run_io(self._build_batch([item]).commit)
+                    written.append(item)
+                except Exception as e:
+                    logger.error(f"Error expiring access code {item[0]}: {e}")
+        
+        for _, _, log_entry in written:
+            self._queue_audit(log_entry)
+        return len(written)
+    
+    def _build_batch(self, pending):
+        """Build a WriteBatch holding the writes of the given expired codes."""
+        batch = self._db.db.batch()
+        for _, writes, _ in pending:
+            for ref, fields, merge in writes:
+                if merge:
+                    batch.set(ref, fields, merge=True)
+                else:
+                    batch.update(ref, fields)
+        return batch
+    
+    def _backoff_ready(self, task: str) -> bool:
+        """Check whether a sub-task is due, i.e. not backing off after failures."""
+        return time.monotonic() >= self._retry_at.get(task, 0.0)
+    
+    def _record_result(self, task: str, ok: bool):
+        """
+        Reset a sub-task's failure count on success; after a failure, push
+        its next run back exponentially so a Firestore outage is not
+        hammered every tick.
+        
+        Args:
+            task: Sub-task name
+            ok: Whether the run succeeded
+        """
+        if ok:
+            if self._fail_count.pop(task, None):
+                self._retry_at.pop(task, None)
+                logger.info(f"Scheduler task {task} recovered")
+            return
+        
+        fails = self._fail_count.get(task, 0) + 1
+        self._fail_count[task] = fails
+        # 0, 1, 3, 7... ticks skipped; jitter spreads retries across instances
+        delay = min(BACKOFF_MAX_SECONDS, TICK_SECONDS * (2 ** (fails - 1) - 1))
+        self._retry_at[task] = time.monotonic() + delay + random.uniform(0, delay / 10)
+        if delay:
+            logger.warning(
+                f"Scheduler task {task} failed {fails} times in a row, "
+                f"backing off {delay}s"
+            )
+    
+    async def _run_io(self, func):
+        """
+        Run a blocking Firestore call on the scheduler's I/O threads so
+        slow RPCs do not stall the event loop.
+        
+        Args:
+            func: Zero-argument callable to run
+            
+        Returns:
+            The callable's result
+        """
+        loop = asyncio.get_running_loop()
+        # Falls back to the loop's default executor before start()
+        return await loop.run_in_executor(self._io_executor, func)
+    
+    def _queue_audit(self, log_entry):
+        """
+        Hand an audit entry to the drainer without waiting on Firestore.
+        
+        Args:
+            log_entry: Entry built by AuditService.build_log_entry
+        """
+        try:
+            self._audit_queue.put_nowait(log_entry)
+        except asyncio.QueueFull:
+            self._audit_dropped += 1
+            logger.error(
+                f"Audit queue full, dropped {log_entry['event_type']} event "
+                f"({self._audit_dropped} dropped so far)"
+            )
+    
+    async def _audit_drainer(self):
+        """
+        Background task writing queued audit events every
+        AUDIT_FLUSH_SECONDS, in batches of up to AUDIT_BATCH_SIZE.
+        """
+        try:
+            while True:
+                await asyncio.sleep(AUDIT_FLUSH_SECONDS)
+                await self._flush_audit()
+        except asyncio.CancelledError:
+            # Scheduler stopping: write everything still pending
+            await self._flush_audit()
+            raise
+    
+    async def _flush_audit(self):
+        """Write all queued audit events, one Firestore batch per chunk."""
+        while not self._audit_queue.empty():
+            entries = []
+            while len(entries) < AUDIT_BATCH_SIZE and not self._audit_queue.empty():
+                entries.append(self._audit_queue.get_nowait())
+            
+            try:
+                if self._db is None:
+                    self._lazy_init()
+                # Blocking commit, kept off the event loop
+                await self._run_io(lambda: self._audit.log_batch(entries))
+            except Exception as e:
+                logger.error(f"Error writing {len(entries)} audit event(s): {e}")
+    
+    async def _load_expired_code(self, places_ref, code_doc, lookups):
+        """
+        Read an expired code and the reservation it points to.
+        
+        Args:
+            places_ref: The parking places collection reference
+            code_doc: The access code document snapshot
+            lookups: Reservation lookup tasks of this run, keyed by ID
+            
+        Returns:
+            tuple: (code_id, code_data, reservation or None)
+        """
+        code_data = code_doc.to_dict()
+        reservation_id = code_data.get("reservation_id")
+        if not reservation_id:
+            return code_doc.id, code_data, None
+        
+        task = lookups.get(reservation_id)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_reservation(places_ref, reservation_id)
+            )
+            lookups[reservation_id] = task
+        
+        return code_doc.id, code_data, await task
+    
+    async def _fetch_reservation(self, places_ref, reservation_id):
+        """
+        Read a reservation document.
+        
+        Args:
+            places_ref: The parking places collection reference
+            reservation_id: The reservation ID
+            
+        Returns:
+            dict: The reservation data, or None if it does not exist
+        """
+        async with self._cleanup_semaphore:
+            snapshot = await self._run_io(places_ref.document(reservation_id).get)
+        
+        return snapshot.to_dict() if snapshot.exists else None
     
     def add_reservation_reminder(self, reservation_id: str, spot_id: str, 
                                   user_id: str, reminder_time_seconds: int):
         """
-        Add a one-time reminder job for a reservation.
+        Add a one-time reminder for a reservation.
         Can be used to notify users before expiry.
+        Must be called from the running event loop.
         
         Args:
             reservation_id: The reservation ID
@@ -229,23 +660,35 @@ class ReservationScheduler:
             user_id: The user ID
             reminder_time_seconds: Seconds from now to send reminder
         """
-        from datetime import datetime, timedelta
+        loop = asyncio.get_running_loop()
         
-        run_time = datetime.utcnow() + timedelta(seconds=reminder_time_seconds)
+        # A new reminder replaces any pending one for the reservation
+        self.cancel_reminder(reservation_id)
         
-        self.scheduler.add_job(
-            self._send_expiry_reminder,
-            trigger="date",
-            run_date=run_time,
-            args=[reservation_id, spot_id, user_id],
-            id=f"reminder_{reservation_id}",
-            name=f"Expiry reminder for reservation {reservation_id}",
-            replace_existing=True
+        # The loop clock is monotonic, immune to wall-clock adjustments
+        deadline = loop.time() + reminder_time_seconds
+        self._reminders[reservation_id] = loop.call_later(
+            reminder_time_seconds,
+            self._fire_reminder,
+            reservation_id, spot_id, user_id, deadline
         )
         
+        run_time = datetime.now(timezone.utc) + timedelta(seconds=reminder_time_seconds)
         logger.info(f"Added reminder for reservation {reservation_id} at {run_time}")
     
-    async def _send_expiry_reminder(self, reservation_id: str, spot_id: str, user_id: str):
+    def _fire_reminder(self, reservation_id: str, spot_id: str, user_id: str,
+                       deadline: float):
+        """Timer callback: send the reminder in a tracked task."""
+        self._reminders.pop(reservation_id, None)
+        task = asyncio.ensure_future(
+            self._send_expiry_reminder(reservation_id, spot_id, user_id, deadline)
+        )
+        # Keep a reference until done so the task is not garbage collected
+        self._reminder_tasks.add(task)
+        task.add_done_callback(self._reminder_tasks.discard)
+    
+    async def _send_expiry_reminder(self, reservation_id: str, spot_id: str, user_id: str,
+                                    deadline: Optional[float] = None):
         """
         Send a reminder to user about upcoming reservation expiry.
         
@@ -253,12 +696,21 @@ class ReservationScheduler:
             reservation_id: The reservation ID
             spot_id: The parking spot ID
             user_id: The user ID
+            deadline: Event loop time the reminder was due, if known
         """
+        if deadline is not None:
+            skew = asyncio.get_running_loop().time() - deadline
+            if abs(skew) >= REMINDER_SKEW_WARNING_SECONDS:
+                logger.warning(
+                    f"Reminder for reservation {reservation_id} fired "
+                    f"{skew:+.1f}s from its deadline (wall clock drift?)"
+                )
+        
         try:
-            from services.websocket_service import get_websocket_manager
+            if self._db is None:
+                self._lazy_init()
             
-            manager = get_websocket_manager()
-            await manager.broadcast({
+            await self._mgr.broadcast({
                 "type": "reservation_reminder",
                 "data": {
                     "reservation_id": reservation_id,
@@ -280,12 +732,10 @@ class ReservationScheduler:
         Args:
             reservation_id: The reservation ID
         """
-        job_id = f"reminder_{reservation_id}"
-        try:
-            self.scheduler.remove_job(job_id)
+        handle = self._reminders.pop(reservation_id, None)
+        if handle is not None:
+            handle.cancel()
             logger.info(f"Cancelled reminder for reservation {reservation_id}")
-        except Exception:
-            pass  # Job might not exist
 
 
 # Singleton instance
@@ -306,7 +756,7 @@ def start_scheduler():
     scheduler.start()
 
 
-def stop_scheduler():
+async def stop_scheduler():
     """Stop the background scheduler."""
     scheduler = get_scheduler()
-    scheduler.stop()
+    await scheduler.stop()